@@ -12,99 +12,133 @@ Usage:
 """
 
 import argparse
+import atexit
 import sys
 import os
-import httpx
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import httpx
 
 # Add parent to path for imports
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 from .core.config import MEMORY_SERVER_URL
 
 
+STATUS_ICONS = {"completed": "🟢", "in_progress": "🟡"}
+
+# Shared client: one keep-alive connection pool for every command in this process.
+_client: Optional["httpx.Client"] = None
+
+
+def _get_client() -> "httpx.Client":
+    """Get or create the shared Memory Server client."""
+    global _client
+    if _client is None:
+        # Deferred import: `--help` and usage errors never pay httpx's import cost
+        import httpx
+        _client = httpx.Client(
+            base_url=MEMORY_SERVER_URL,
+            timeout=httpx.Timeout(10.0, connect=3.0),
+            limits=httpx.Limits(max_keepalive_connections=4, max_connections=8)
+        )
+        atexit.register(_client.close)
+    return _client
+
+
+def _call(method: str, path: str, **kwargs) -> Optional["httpx.Response"]:
+    """Send a request to the Memory Server. Returns None if it is unreachable."""
+    import httpx
+    try:
+        return _get_client().request(method, path, **kwargs)
+    except httpx.ConnectError:
+        return None
+
+
 def start(args):
     """Start the Governed Hive services."""
     print("Starting Governed Hive...")
-    try:
-        r = httpx.post(f"{MEMORY_SERVER_URL}/state/update", json={"new_state": "EXECUTING"})
-        if r.status_code == 200:
-            print("✅ Governed Hive started successfully!")
-        else:
-            print(f"❌ Failed to start: {r.text}")
-    except httpx.ConnectError:
+    r = _call("POST", "/state/update", json={"new_state": "EXECUTING"})
+    if r is None:
         print("❌ Memory Server not running. Start it first with:")
         print("   python .core/services/memory_server.py")
+    elif r.status_code == 200:
+        print("✅ Governed Hive started successfully!")
+    else:
+        print(f"❌ Failed to start: {r.text}")
 
 
 def stop(args):
     """Stop the Governed Hive services."""
     print("Stopping Governed Hive...")
-    try:
-        r = httpx.post(f"{MEMORY_SERVER_URL}/state/update", json={"new_state": "IDLE"})
-        if r.status_code == 200:
-            print("✅ Governed Hive stopped successfully!")
-        else:
-            print(f"❌ Failed to stop: {r.text}")
-    except httpx.ConnectError:
+    r = _call("POST", "/state/update", json={"new_state": "IDLE"})
+    if r is None:
         print("❌ Memory Server not reachable.")
+    elif r.status_code == 200:
+        print("✅ Governed Hive stopped successfully!")
+    else:
+        print(f"❌ Failed to stop: {r.text}")
 
 
 def status(args):
     """Query the status of the Governed Hive."""
-    try:
-        r = httpx.get(f"{MEMORY_SERVER_URL}/state")
-        if r.status_code == 200:
-            state = r.json().get("current_state", "UNKNOWN")
-            print(f"🔹 Governed Hive Status: {state}")
-        else:
-            print(f"❌ Failed to get status: {r.text}")
-    except httpx.ConnectError:
+    r = _call("GET", "/state")
+    if r is None:
         print("❌ Memory Server not running.")
+    elif r.status_code == 200:
+        state = r.json().get("current_state", "UNKNOWN")
+        print(f"🔹 Governed Hive Status: {state}")
+    else:
+        print(f"❌ Failed to get status: {r.text}")
 
 
 def add_task(args):
     """Add a new task to the Governed Hive."""
-    try:
-        payload = {
-            "text": args.text,
-            "assignee": args.assignee,
-            "priority": args.priority
-        }
-        r = httpx.post(f"{MEMORY_SERVER_URL}/tasks/create", json=payload)
-        if r.status_code == 200:
-            task_id = r.json().get("task_id")
-            print(f"✅ Task added successfully! ID: {task_id}")
-        else:
-            print(f"❌ Failed to add task: {r.text}")
-    except httpx.ConnectError:
+    payload = {
+        "text": args.text,
+        "assignee": args.assignee,
+        "priority": args.priority
+    }
+    r = _call("POST", "/tasks/create", json=payload)
+    if r is None:
         print("❌ Memory Server not running.")
+    elif r.status_code == 200:
+        task_id = r.json().get("task_id")
+        print(f"✅ Task added successfully! ID: {task_id}")
+    else:
+        print(f"❌ Failed to add task: {r.text}")
 
 
 def list_tasks(args):
     """List all tasks in the Governed Hive."""
-    try:
-        params = {}
-        if args.status:
-            params["status"] = args.status
-        if args.assignee:
-            params["assignee"] = args.assignee
-        
-        r = httpx.get(f"{MEMORY_SERVER_URL}/tasks/list", params=params)
-        if r.status_code == 200:
-            tasks = r.json().get("tasks", [])
-            if not tasks:
-                print("📭 No tasks found.")
-                return
-            
-            print(f"📋 Found {len(tasks)} task(s):\n")
-            for t in tasks:
-                status_icon = "🟢" if t["status"] == "completed" else "🟡" if t["status"] == "in_progress" else "⚪"
-                print(f"  {status_icon} [{t['id'][:8]}...] {t['text'][:50]}...")
-                print(f"     Assignee: {t.get('assignee', 'unassigned')} | Status: {t['status']}")
-                print()
-        else:
-            print(f"❌ Failed to list tasks: {r.text}")
-    except httpx.ConnectError:
+    params = {}
+    if args.status:
+        params["status"] = args.status
+    if args.assignee:
+        params["assignee"] = args.assignee
+
+    r = _call("GET", "/tasks/list", params=params)
+    if r is None:
         print("❌ Memory Server not running.")
+        return
+    if r.status_code != 200:
+        print(f"❌ Failed to list tasks: {r.text}")
+        return
+
+    tasks = r.json().get("tasks", [])
+    if not tasks:
+        print("📭 No tasks found.")
+        return
+
+    # Build the whole listing first and emit it with a single write
+    lines = [f"📋 Found {len(tasks)} task(s):\n"]
+    for t in tasks:
+        status_icon = STATUS_ICONS.get(t["status"], "⚪")
+        lines.append(f"  {status_icon} [{t['id'][:8]}...] {t['text'][:50]}...")
+        lines.append(f"     Assignee: {t.get('assignee', 'unassigned')} | Status: {t['status']}")
+        lines.append("")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
 
 def main():
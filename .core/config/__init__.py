@@ -10,6 +10,10 @@ from .settings import (
     # LLM
     DEFAULT_MODEL,
     DEFAULT_TIMEOUT,
+    LLM_MAX_CONNECTIONS,
+    # Agent Concurrency
+    CRITIC_MAX_CONCURRENCY,
+    ENGINEER_MAX_CONCURRENCY,
     # Directories
     WORKSPACE_DIR,
     OUTPUT_DIR,
@@ -27,6 +31,8 @@ from .settings import (
     # Timing
     DEFAULT_POLL_INTERVAL,
     HEARTBEAT_TIMEOUT,
+    LONG_POLL_TIMEOUT,
+    LONG_POLL_MAX_TASKS,
     # Vector Store
     EMBEDDING_MODEL_NAME,
     SYNC_INTERVAL,
@@ -35,6 +41,11 @@ from .settings import (
     # Databases
     DB_URI,
     SQLITE_DB,
+    LLM_CACHE_DIR,
+    # LLM Prompt Cache
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_TTL,
+    LLM_CACHE_MAX_BYTES,
 )
 
 __all__ = [
@@ -44,6 +55,9 @@ __all__ = [
     "SCOUT_SERVICE_URL",
     "DEFAULT_MODEL",
     "DEFAULT_TIMEOUT",
+    "LLM_MAX_CONNECTIONS",
+    "CRITIC_MAX_CONCURRENCY",
+    "ENGINEER_MAX_CONCURRENCY",
     "WORKSPACE_DIR",
     "OUTPUT_DIR",
     "INCOMING_DIR",
@@ -57,10 +71,16 @@ __all__ = [
     "ESCALATION_THRESHOLD",
     "DEFAULT_POLL_INTERVAL",
     "HEARTBEAT_TIMEOUT",
+    "LONG_POLL_TIMEOUT",
+    "LONG_POLL_MAX_TASKS",
     "EMBEDDING_MODEL_NAME",
     "SYNC_INTERVAL",
     "BUFFER_SIZE",
     "DECAY_RATE",
     "DB_URI",
     "SQLITE_DB",
+    "LLM_CACHE_DIR",
+    "LLM_CACHE_ENABLED",
+    "LLM_CACHE_TTL",
+    "LLM_CACHE_MAX_BYTES",
 ]
@@ -24,6 +24,12 @@ SCOUT_SERVICE_URL = os.getenv("SCOUT_SERVICE_URL", "http://127.0.0.1:8003")
 # --- LLM Configuration ---
 DEFAULT_MODEL = os.getenv("LLM_MODEL", "gpt-4o-mini")
 DEFAULT_TIMEOUT = int(os.getenv("AGENT_TIMEOUT", "120"))  # seconds
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "32"))  # shared aiohttp pool for LLM calls
+
+# --- Agent Concurrency ---
+# Tasks an agent works on at once (reviews spawn flake8/pytest, so keep the Critic lower)
+CRITIC_MAX_CONCURRENCY = int(os.getenv("CRITIC_MAX_CONCURRENCY", "4"))
+ENGINEER_MAX_CONCURRENCY = int(os.getenv("ENGINEER_MAX_CONCURRENCY", "8"))
 
 # --- Directories ---
 WORKSPACE_DIR = os.path.abspath("./workspace")
@@ -35,6 +41,12 @@ DOCS_DIR = os.path.abspath("./docs")
 # --- Database Paths ---
 DB_URI = os.path.abspath("./.core/memory/lancedb")
 SQLITE_DB = os.path.abspath("./.core/memory/tasks.db")
+LLM_CACHE_DIR = os.path.abspath("./.core/cache/llm")  # persistent prompt cache (needs diskcache)
+
+# --- LLM Prompt Cache ---
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE", "on").lower() not in ("0", "off", "false", "no")
+LLM_CACHE_TTL = int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600)))  # seconds a persisted completion lives
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_MB", "256")) * 1024 * 1024  # disk cache size bound
 
 # --- API Keys (optional) ---
 TAVILY_API_KEY = os.getenv("TAVILY_API_KEY", "")
@@ -49,6 +61,8 @@ ESCALATION_THRESHOLD = float(os.getenv("GOVERNOR_ESCALATION_THRESHOLD", "0.7"))
 # --- Polling / Timing ---
 DEFAULT_POLL_INTERVAL = 10  # seconds
 HEARTBEAT_TIMEOUT = 60  # seconds
+LONG_POLL_TIMEOUT = 30  # seconds the server may hold a /next request open
+LONG_POLL_MAX_TASKS = 16  # most tasks one /next request may claim
 
 # --- Vector Store ---
 EMBEDDING_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
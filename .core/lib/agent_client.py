@@ -7,6 +7,8 @@ Run this in the background while using Gemini CLI to auto-receive tasks.
 
 Usage:
   python agent_client.py --agent-id gemini-cli --poll-interval 5
+
+HTTP/2 is used when available: pip install 'httpx[http2]'
 """
 
 import argparse
@@ -18,17 +20,68 @@ from typing import Optional, Dict, Any
 
 import httpx
 
+# HTTP/2 support is optional (pip install 'httpx[http2]')
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 # --- CONFIGURATION ---
 
 # --- CONFIGURATION ---
 try:
     from ..config import MEMORY_SERVER_URL as DEFAULT_SERVER, DEFAULT_POLL_INTERVAL
+    from .json_utils import parse_metadata, post_json
 except ImportError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
     from .core.config import MEMORY_SERVER_URL as DEFAULT_SERVER, DEFAULT_POLL_INTERVAL
+    from .core.lib.json_utils import parse_metadata, post_json
 DEFAULT_AGENT_ID = "gemini-cli"
 
+# Local prefix -> full task ID cache so complete/review skip a server lookup
+TASK_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "studiomode", "tasks.json")
+TASK_CACHE_MAX_ENTRIES = 256
+
+
+def load_task_cache() -> Dict[str, str]:
+    """Load the prefix -> task ID cache (empty if missing or unreadable)."""
+    try:
+        with open(TASK_CACHE_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def remember_tasks(task_ids: list):
+    """Record task IDs in the local cache (oldest entries evicted)."""
+    cache = load_task_cache()
+    for task_id in task_ids:
+        cache.pop(task_id[:8], None)
+        cache[task_id[:8]] = task_id
+    _save_task_cache(dict(list(cache.items())[-TASK_CACHE_MAX_ENTRIES:]))
+
+
+def forget_task(task_id: str):
+    """Drop a task that is no longer ours to act on (completed or in review)."""
+    cache = load_task_cache()
+    if cache.get(task_id[:8]) == task_id:
+        del cache[task_id[:8]]
+        _save_task_cache(cache)
+
+
+def _save_task_cache(cache: Dict[str, str]):
+    """Write the cache with an atomic replace (best effort)."""
+    try:
+        os.makedirs(os.path.dirname(TASK_CACHE_PATH), exist_ok=True)
+        tmp_path = TASK_CACHE_PATH + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, TASK_CACHE_PATH)
+    except OSError:
+        pass
+
 
 
 class AgentClient:
@@ -38,15 +91,22 @@ class AgentClient:
         self.server_url = server_url
         self.agent_id = agent_id
         self.agent_type = agent_type
-        self.client = httpx.Client(timeout=30.0)
+        # Single-host polling workload: a small, long-lived pool is enough
+        self.client = httpx.Client(
+            base_url=server_url,
+            http2=HAS_HTTP2,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(max_connections=2, max_keepalive_connections=2, keepalive_expiry=120.0)
+        )
         self.registered = False
     
     def register(self, capabilities: list = None) -> bool:
         """Register this agent with the Memory Server."""
         try:
-            resp = self.client.post(
-                f"{self.server_url}/agents/register",
-                json={
+            resp = post_json(
+                self.client,
+                "/agents/register",
+                {
                     "agent_id": self.agent_id,
                     "agent_type": self.agent_type,
                     "capabilities": capabilities or ["code", "research", "analysis"]
@@ -63,15 +123,15 @@ class AgentClient:
     def heartbeat(self) -> bool:
         """Send heartbeat to show agent is still active."""
         try:
-            resp = self.client.post(f"{self.server_url}/agents/heartbeat/{self.agent_id}")
+            resp = self.client.post(f"/agents/heartbeat/{self.agent_id}")
             return resp.status_code == 200
-        except:
+        except httpx.HTTPError:
             return False
     
     def get_next_task(self) -> Optional[Dict[str, Any]]:
         """Poll for the next available task."""
         try:
-            resp = self.client.get(f"{self.server_url}/agents/{self.agent_id}/next")
+            resp = self.client.get(f"/agents/{self.agent_id}/next")
             resp.raise_for_status()
             data = resp.json()
             return data.get("task")
@@ -83,41 +143,70 @@ class AgentClient:
         """Get all pending tasks without claiming."""
         try:
             resp = self.client.get(
-                f"{self.server_url}/tasks/list",
+                "/tasks/list",
                 params={"status": "pending", "assignee": self.agent_id}
             )
             return resp.json().get("tasks", [])
-        except:
+        except (httpx.HTTPError, ValueError):
             return []
     
+    def resolve_task_id(self, prefix: str) -> Optional[str]:
+        """
+        Resolve a task ID prefix, checking the local cache before the server.
+        The server only matches pending tasks assigned to this agent.
+        """
+        cached = load_task_cache().get(prefix[:8])
+        if cached and cached.startswith(prefix):
+            return cached
+        try:
+            resp = self.client.get(
+                f"/tasks/resolve/{prefix}",
+                params={"status": "pending", "assignee": self.agent_id}
+            )
+            if resp.status_code == 200:
+                task_id = resp.json().get("task_id")
+                remember_tasks([task_id])
+                return task_id
+        except httpx.HTTPError:
+            pass
+        return None
+    
     def complete_task(self, task_id: str, result: str = "") -> bool:
         """Mark a task as completed."""
         try:
-            resp = self.client.post(
-                f"{self.server_url}/tasks/update",
-                json={
+            resp = post_json(
+                self.client,
+                "/tasks/update",
+                {
                     "task_id": task_id,
                     "status": "completed",
                     "metadata": {"result": result}
                 }
             )
-            return resp.status_code == 200
-        except:
+            if resp.status_code != 200:
+                return False
+            forget_task(task_id)
+            return True
+        except httpx.HTTPError:
             return False
     
     def submit_for_review(self, task_id: str, output_path: str = "") -> bool:
         """Submit task for review."""
         try:
-            resp = self.client.post(
-                f"{self.server_url}/tasks/update",
-                json={
+            resp = post_json(
+                self.client,
+                "/tasks/update",
+                {
                     "task_id": task_id,
                     "status": "review",
                     "metadata": {"output_path": output_path}
                 }
             )
-            return resp.status_code == 200
-        except:
+            if resp.status_code != 200:
+                return False
+            forget_task(task_id)
+            return True
+        except httpx.HTTPError:
             return False
 
 
@@ -126,7 +215,7 @@ def format_task(task: dict) -> str:
     if not task:
         return "No task"
     
-    metadata = json.loads(task.get("metadata", "{}"))
+    metadata = parse_metadata(task.get("metadata"))
     lines = [
         f"📋 Task: {task['text']}",
         f"   ID: {task['id'][:8]}...",
@@ -156,6 +245,7 @@ def run_polling_loop(client: AgentClient, interval: int, interactive: bool = Tru
             
             if task and task["id"] != last_task_id:
                 last_task_id = task["id"]
+                remember_tasks([task["id"]])
                 print("\n" + "="*60)
                 print("📬 NEW TASK RECEIVED!")
                 print("="*60)
@@ -200,6 +290,7 @@ def main():
     elif args.command == "list":
         tasks = client.get_pending_tasks()
         if tasks:
+            remember_tasks([t["id"] for t in tasks])
             print(f"📋 Pending tasks for '{args.agent_id}':\n")
             for task in tasks:
                 print(format_task(task))
@@ -212,8 +303,7 @@ def main():
             print("Error: task_id required for complete command")
             sys.exit(1)
         # Find full task ID from prefix
-        tasks = client.get_pending_tasks()
-        full_id = next((t["id"] for t in tasks if t["id"].startswith(args.task_id)), None)
+        full_id = client.resolve_task_id(args.task_id)
         if full_id:
             if client.complete_task(full_id, args.result):
                 print(f"✅ Task {args.task_id} marked complete!")
@@ -226,8 +316,7 @@ def main():
         if not args.task_id:
             print("Error: task_id required for review command")
             sys.exit(1)
-        tasks = client.get_pending_tasks()
-        full_id = next((t["id"] for t in tasks if t["id"].startswith(args.task_id)), None)
+        full_id = client.resolve_task_id(args.task_id)
         if full_id:
             if client.submit_for_review(full_id):
                 print(f"📤 Task {args.task_id} submitted for review!")
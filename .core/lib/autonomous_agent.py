@@ -8,16 +8,17 @@ Captures output, handles errors/timeouts, and sends notifications.
 Usage:
   python autonomous_agent.py --agent-id gemini-cli --poll-interval 10
   python autonomous_agent.py --agent-id gemini-cli --model gpt-4o-mini
+  python autonomous_agent.py --agent-id gemini-cli --long-poll 0   # plain short polling
 """
 
 import argparse
 import asyncio
-import json
 import os
 import sys
 import time
-from datetime import datetime
-from typing import Optional, Dict, Any, List
+from collections import deque
+from datetime import datetime, timezone
+from typing import Optional, Dict, Any, List, Deque
 from dataclasses import dataclass, asdict
 from enum import Enum
 
@@ -31,18 +32,27 @@ except ImportError:
     HAS_LITELLM = False
     print("[!] litellm not installed. Install with: pip install litellm")
 
+# uvloop: faster event loop for socket I/O (optional, not available on Windows)
+try:
+    import uvloop
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 # --- CONFIGURATION ---
 
 # --- CONFIGURATION ---
 try:
-    from ..config import MEMORY_SERVER_URL, DEFAULT_MODEL, DEFAULT_TIMEOUT, OUTPUT_DIR
-    from ..lib.memory_client import AsyncMemoryClient
+    from ..config import MEMORY_SERVER_URL, DEFAULT_MODEL, DEFAULT_TIMEOUT, OUTPUT_DIR, LONG_POLL_TIMEOUT
+    from ..lib.memory_client import AsyncMemoryClient, get_shared_client, close_shared_client
+    from ..lib.json_utils import parse_metadata
 except ImportError:
     # Fallback for standalone execution
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-    from .core.config import MEMORY_SERVER_URL, DEFAULT_MODEL, DEFAULT_TIMEOUT, OUTPUT_DIR
-    from .core.lib.memory_client import AsyncMemoryClient
+    from .core.config import MEMORY_SERVER_URL, DEFAULT_MODEL, DEFAULT_TIMEOUT, OUTPUT_DIR, LONG_POLL_TIMEOUT
+    from .core.lib.memory_client import AsyncMemoryClient, get_shared_client, close_shared_client
+    from .core.lib.json_utils import parse_metadata
 
 
 try:
@@ -51,7 +61,7 @@ except ImportError:
     from .core.models import TaskStatus
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ExecutionResult:
     """Result of task execution."""
     task_id: str
@@ -64,7 +74,7 @@ class ExecutionResult:
     output_path: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Notification:
     """Notification for task events."""
     timestamp: str
@@ -75,6 +85,37 @@ class Notification:
     details: Dict[str, Any] = None
 
 
+# Console indicators per notification event (text, Windows compatible)
+NOTIFY_ICONS = {
+    "started": "[>>]",
+    "completed": "[OK]",
+    "failed": "[ERR]",
+    "timeout": "[TIME]",
+    "registered": "[REG]"
+}
+
+# Minimum seconds between idle "Polling..." indicator updates (--verbose)
+IDLE_TICK_INTERVAL = 5.0
+
+# Most recent notifications kept in memory
+NOTIFICATION_HISTORY = 500
+
+# Upper bound for the error backoff in run_loop
+MAX_BACKOFF_SECONDS = 60
+
+
+def _write_text(path: str, text: str):
+    """
+    Atomically write a text file (run via asyncio.to_thread).
+    Writes to a temp file and renames it over the target, so a crash
+    never leaves a truncated report behind.
+    """
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
 class AutonomousAgent:
     """
     Autonomous agent that polls for tasks and executes them via LLM.
@@ -85,14 +126,40 @@ class AutonomousAgent:
         agent_id: str,
         model: str = DEFAULT_MODEL,
         timeout: int = DEFAULT_TIMEOUT,
-        server_url: str = MEMORY_SERVER_URL
+        server_url: str = MEMORY_SERVER_URL,
+        concurrency: int = 1,
+        verbose: bool = False,
+        notification_history: int = NOTIFICATION_HISTORY
     ):
         self.agent_id = agent_id
         self.model = model
         self.timeout = timeout
         self.server_url = server_url
-        self.client = AsyncMemoryClient(base_url=server_url, timeout=30.0)
-        self.notifications: List[Notification] = []
+        self.concurrency = max(1, concurrency)
+        self.verbose = verbose
+        self._last_tick = 0.0
+        self._err_count = 0
+        
+        # The system prompt only depends on agent_id: build it once so every
+        # call shares an identical prefix (eligible for provider prompt caching)
+        self._system_prompt = f"""You are an autonomous AI agent named '{agent_id}'.
+Your task is to complete the following work item thoroughly and professionally.
+
+Guidelines:
+1. Be thorough but concise
+2. If the task requires code, write complete, working code
+3. If the task requires research, provide sources and summaries
+4. Structure your output clearly with headers and sections
+5. If you cannot complete the task, explain why clearly"""
+        if "claude" in model or model.startswith("anthropic/"):
+            # Anthropic-style explicit cache breakpoint
+            self._system_message = {"role": "system", "content": [
+                {"type": "text", "text": self._system_prompt, "cache_control": {"type": "ephemeral"}}
+            ]}
+        else:
+            self._system_message = {"role": "system", "content": self._system_prompt}
+        self.client = AsyncMemoryClient(base_url=server_url, timeout=30.0, client=get_shared_client())
+        self.notifications: Deque[Notification] = deque(maxlen=notification_history)
         self.running = False
         
         os.makedirs(OUTPUT_DIR, exist_ok=True)
@@ -111,12 +178,24 @@ class AutonomousAgent:
         return False
     
     async def heartbeat(self) -> bool:
-        """Send heartbeat to server."""
-        return await self.client.heartbeat(self.agent_id)
+        """
+        Send heartbeat to server. Returns False only when the server is
+        unreachable; if it answers but has forgotten this agent (404, e.g.
+        after a restart) the agent re-registers.
+        """
+        status = await self.client.heartbeat_status(self.agent_id)
+        if status == 404:
+            print(f"[WARN] Memory Server lost registration for '{self.agent_id}', re-registering")
+            await self.register()
+        return status is not None
+    
+    async def get_next_task(self, wait: int = 0) -> Optional[Dict[str, Any]]:
+        """Poll for next available task (long-polls for `wait` seconds if > 0)."""
+        return await self.client.get_next_task(self.agent_id, wait=wait)
     
-    async def get_next_task(self) -> Optional[Dict[str, Any]]:
-        """Poll for next available task."""
-        return await self.client.get_next_task(self.agent_id)
+    async def get_next_tasks(self, n: int = 4, wait: int = 0) -> List[Dict[str, Any]]:
+        """Claim up to n tasks in a single poll."""
+        return await self.client.get_next_tasks(self.agent_id, n, wait=wait)
     
     async def update_task(self, task_id: str, status: str, metadata: Dict = None) -> bool:
         """Update task status."""
@@ -129,7 +208,7 @@ class AutonomousAgent:
     def _notify(self, event: str, task_id: str, task_name: str, message: str, details: Dict = None):
         """Create and store a notification."""
         notification = Notification(
-            timestamp=datetime.utcnow().isoformat(),
+            timestamp=datetime.now(timezone.utc).isoformat(),
             event=event,
             task_id=task_id,
             task_name=task_name,
@@ -139,14 +218,7 @@ class AutonomousAgent:
         self.notifications.append(notification)
         
         # Print to console with text indicators (Windows compatible)
-        icons = {
-            "started": "[>>]",
-            "completed": "[OK]",
-            "failed": "[ERR]",
-            "timeout": "[TIME]",
-            "registered": "[REG]"
-        }
-        icon = icons.get(event, "[*]")
+        icon = NOTIFY_ICONS.get(event, "[*]")
         print(f"\n{icon} [{event.upper()}] {message}")
         if details:
             for k, v in details.items():
@@ -156,7 +228,7 @@ class AutonomousAgent:
         """Execute a task using the LLM."""
         task_id = task["id"]
         task_text = task["text"]
-        metadata = json.loads(task.get("metadata", "{}"))
+        metadata = parse_metadata(task.get("metadata"))
         description = metadata.get("description", "")
         
         self._notify(
@@ -167,17 +239,7 @@ class AutonomousAgent:
         
         start_time = time.time()
         
-        # Build prompt
-        system_prompt = f"""You are an autonomous AI agent named '{self.agent_id}'.
-Your task is to complete the following work item thoroughly and professionally.
-
-Guidelines:
-1. Be thorough but concise
-2. If the task requires code, write complete, working code
-3. If the task requires research, provide sources and summaries
-4. Structure your output clearly with headers and sections
-5. If you cannot complete the task, explain why clearly"""
-
+        # Build prompt (system message is prebuilt in __init__)
         user_prompt = f"""## Task
 {task_text}
 
@@ -191,13 +253,12 @@ Complete this task to the best of your ability. Provide a complete, actionable r
             if not HAS_LITELLM:
                 raise RuntimeError("litellm not installed")
             
-            # Execute with timeout
+            # Execute with timeout (native async call, no worker thread)
             response = await asyncio.wait_for(
-                asyncio.to_thread(
-                    litellm.completion,
+                litellm.acompletion(
                     model=self.model,
                     messages=[
-                        {"role": "system", "content": system_prompt},
+                        self._system_message,
                         {"role": "user", "content": user_prompt}
                     ],
                     max_tokens=4000
@@ -211,14 +272,17 @@ Complete this task to the best of your ability. Provide a complete, actionable r
             
             # Save output to file
             output_path = os.path.join(OUTPUT_DIR, f"{task_id[:8]}_{int(time.time())}.md")
-            with open(output_path, "w", encoding="utf-8") as f:
-                f.write(f"# Task: {task_text}\n\n")
-                f.write(f"**Agent:** {self.agent_id}\n")
-                f.write(f"**Model:** {self.model}\n")
-                f.write(f"**Duration:** {duration:.2f}s\n")
-                f.write(f"**Tokens:** {tokens}\n\n")
-                f.write("---\n\n")
-                f.write(output)
+            report = (
+                f"# Task: {task_text}\n\n"
+                f"**Agent:** {self.agent_id}\n"
+                f"**Model:** {self.model}\n"
+                f"**Duration:** {duration:.2f}s\n"
+                f"**Tokens:** {tokens}\n\n"
+                "---\n\n"
+                f"{output}"
+            )
+            # Write off the event loop so heartbeats/other tasks keep running
+            await asyncio.to_thread(_write_text, output_path, report)
             
             result = ExecutionResult(
                 task_id=task_id,
@@ -291,34 +355,36 @@ Complete this task to the best of your ability. Provide a complete, actionable r
             TaskStatus.TIMEOUT: "failed"
         }
         
-        await self.update_task(
-            task_id,
-            status_map.get(result.status, "failed"),
-            metadata={
-                "output_path": result.output_path,
-                "duration": result.duration_seconds,
-                "model": result.model_used,
-                "tokens": result.tokens_used,
-                "error": result.error
-            }
-        )
-        
-        # Log to memory
-        await self.add_memory(
-            f"Agent '{self.agent_id}' {result.status.value} task: {task['text'][:50]}...",
-            mem_type="episodic",
-            metadata={"task_id": task_id, "status": result.status.value}
+        # Status update and memory log are independent: send both in parallel
+        await asyncio.gather(
+            self.update_task(
+                task_id,
+                status_map.get(result.status, "failed"),
+                metadata={
+                    "output_path": result.output_path,
+                    "duration": result.duration_seconds,
+                    "model": result.model_used,
+                    "tokens": result.tokens_used,
+                    "error": result.error
+                }
+            ),
+            self.add_memory(
+                f"Agent '{self.agent_id}' {result.status.value} task: {task['text'][:50]}...",
+                mem_type="episodic",
+                metadata={"task_id": task_id, "status": result.status.value}
+            )
         )
         
         return result
     
-    async def run_loop(self, poll_interval: int = 10, max_tasks: int = 0):
+    async def run_loop(self, poll_interval: int = 10, max_tasks: int = 0, long_poll: int = LONG_POLL_TIMEOUT):
         """
         Main autonomous execution loop.
         
         Args:
-            poll_interval: Seconds between polls
+            poll_interval: Seconds between polls (short-polling only)
             max_tasks: Maximum tasks to process (0 = unlimited)
+            long_poll: Seconds the server may hold each poll open (0 = short-poll)
         """
         self.running = True
         tasks_processed = 0
@@ -326,44 +392,68 @@ Complete this task to the best of your ability. Provide a complete, actionable r
         print(f"\n[AGENT] Autonomous Agent '{self.agent_id}' Starting...")
         print(f"   Model: {self.model}")
         print(f"   Timeout: {self.timeout}s")
-        print(f"   Poll Interval: {poll_interval}s")
+        print(f"   Concurrency: {self.concurrency}")
+        if long_poll > 0:
+            print(f"   Long Poll: {long_poll}s")
+        else:
+            print(f"   Poll Interval: {poll_interval}s")
         print(f"   Press Ctrl+C to stop\n")
         
         while self.running:
             try:
-                # Heartbeat
-                await self.heartbeat()
+                # Heartbeat (doubles as a reachability check; HTTP errors don't count)
+                alive = await self.heartbeat()
                 
-                # Poll for task
-                task = await self.get_next_task()
+                # Poll for a batch, never claiming more than max_tasks allows
+                batch = self.concurrency
+                if max_tasks > 0:
+                    batch = min(batch, max_tasks - tasks_processed)
+                tasks = await self.get_next_tasks(batch, wait=long_poll)
                 
-                if task:
-                    # Process the task
-                    result = await self.process_task(task)
-                    tasks_processed += 1
+                if tasks:
+                    # Process the batch concurrently
+                    await asyncio.gather(*(self.process_task(t) for t in tasks))
+                    tasks_processed += len(tasks)
                     
                     if max_tasks > 0 and tasks_processed >= max_tasks:
                         print(f"\n[DONE] Processed {tasks_processed} tasks. Stopping.")
                         break
                 else:
-                    # No task available
-                    print(f"[...] Polling... ({datetime.now().strftime('%H:%M:%S')})", end="\r")
+                    # No task available: optional, rate-limited idle indicator
+                    if self.verbose and time.monotonic() - self._last_tick > IDLE_TICK_INTERVAL:
+                        self._last_tick = time.monotonic()
+                        sys.stdout.write(f"[...] Polling... ({time.strftime('%H:%M:%S')})\r")
+                        sys.stdout.flush()
+                
+                if not alive and not tasks:
+                    # Server unreachable: back off instead of hammering it
+                    await self._backoff(poll_interval)
+                    continue
+                self._err_count = 0
                 
-                await asyncio.sleep(poll_interval)
+                # Long-polling already waited server-side; re-poll immediately
+                if long_poll <= 0:
+                    await asyncio.sleep(poll_interval)
                 
             except KeyboardInterrupt:
                 print("\n\n[BYE] Stopping autonomous agent...")
                 break
             except Exception as e:
                 print(f"\n[ERR] Loop error: {e}")
-                await asyncio.sleep(poll_interval)
+                await self._backoff(poll_interval)
         
         self.running = False
         print(f"\n[SUMMARY] Session Summary: Processed {tasks_processed} tasks")
     
+    async def _backoff(self, poll_interval: int):
+        """Sleep with exponential backoff after consecutive loop failures."""
+        delay = min(MAX_BACKOFF_SECONDS, max(1, poll_interval) * 2 ** min(self._err_count, 6))
+        self._err_count += 1
+        await asyncio.sleep(delay)
+    
     async def close(self):
-        """Cleanup resources."""
-        await self.client.aclose()
+        """Cleanup resources (the shared HTTP pool is closed by main())."""
+        await self.client.close()
 
 
 async def main():
@@ -373,7 +463,12 @@ async def main():
     parser.add_argument("--timeout", type=int, default=DEFAULT_TIMEOUT, help="Task timeout (seconds)")
     parser.add_argument("--poll-interval", type=int, default=10, help="Poll interval (seconds)")
     parser.add_argument("--max-tasks", type=int, default=0, help="Max tasks (0=unlimited)")
+    parser.add_argument("--concurrency", type=int, default=1, help="Tasks to claim and run concurrently per poll")
+    parser.add_argument("--long-poll", type=int, default=LONG_POLL_TIMEOUT, help="Long-poll wait (seconds, 0=short polling)")
     parser.add_argument("--server", default=MEMORY_SERVER_URL, help="Memory Server URL")
+    parser.add_argument("--verbose", action="store_true", help="Show idle polling indicator")
+    parser.add_argument("--notifications-ring-size", type=int, default=NOTIFICATION_HISTORY,
+                        help="Notifications kept in memory")
     
     args = parser.parse_args()
     
@@ -381,7 +476,10 @@ async def main():
         agent_id=args.agent_id,
         model=args.model,
         timeout=args.timeout,
-        server_url=args.server
+        server_url=args.server,
+        concurrency=args.concurrency,
+        verbose=args.verbose,
+        notification_history=args.notifications_ring_size
     )
     
     try:
@@ -391,11 +489,25 @@ async def main():
         
         await agent.run_loop(
             poll_interval=args.poll_interval,
-            max_tasks=args.max_tasks
+            max_tasks=args.max_tasks,
+            long_poll=args.long_poll
         )
     finally:
         await agent.close()
+        await close_shared_client()
+
+
+def run(coro):
+    """Run a coroutine on uvloop when available, else the fastest stock loop."""
+    if HAS_UVLOOP:
+        if sys.version_info >= (3, 12):
+            return asyncio.run(coro, loop_factory=uvloop.new_event_loop)
+        uvloop.install()
+    elif sys.platform == "win32":
+        # Selector loop is cheaper than Proactor for pure socket workloads
+        asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    return asyncio.run(coro)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main())
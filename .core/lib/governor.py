@@ -6,22 +6,55 @@ Provides rate limiting, action whitelisting, human escalation, and audit logging
 """
 
 import os
+import re
 import json
 import time
+import uuid
+import queue
+import atexit
+import fnmatch
 import hashlib
+from collections import deque
 from datetime import datetime
-from typing import List, Optional, Dict, Any, Callable
-from dataclasses import dataclass, field, asdict
+from typing import List, Optional, Dict, Any, Callable, Deque
+from dataclasses import dataclass, field
 from enum import Enum
-from functools import wraps
+from functools import wraps, lru_cache
 import threading
 
+try:
+    from .json_utils import dumps as json_dumps
+except ImportError:
+    from json_utils import dumps as json_dumps
+
+# Aho-Corasick multi-substring matcher (optional: pip install pyahocorasick)
+try:
+    import ahocorasick
+    HAS_AHOCORASICK = True
+except ImportError:
+    HAS_AHOCORASICK = False
+
+# Redis for cross-process rate limiting (optional: pip install redis)
+try:
+    import redis
+    HAS_REDIS = True
+except ImportError:
+    HAS_REDIS = False
+
 # --- CONFIGURATION ---
 AUDIT_LOG_PATH = "./.core/logs/governor_audit.jsonl"
 REJECT_LOG_PATH = "./.core/logs/governor_rejects.md"
 MAX_LLM_CALLS_PER_MINUTE = int(os.getenv("GOVERNOR_LLM_RATE", "30"))
 MAX_FILE_OPS_PER_MINUTE = int(os.getenv("GOVERNOR_FILE_RATE", "60"))
 ESCALATION_THRESHOLD = float(os.getenv("GOVERNOR_ESCALATION_THRESHOLD", "0.7"))
+CLASSIFY_CACHE_SIZE = 4096  # memoized detail -> risk decisions per shell/file-write rule
+GOVERNOR_REDIS_URL = os.getenv("GOVERNOR_REDIS_URL", "")  # empty = per-process limits
+AUDIT_QUEUE_SIZE = 10000  # entries beyond this backlog are dropped (and counted), never blocking
+AUDIT_BATCH_SIZE = 64     # entries written per flush
+AUDIT_ATOMIC_WRITE = 4096  # PIPE_BUF: O_APPEND writes up to this size don't interleave across processes
+# Secret key for audit checksums (BLAKE2s keys are at most 32 bytes)
+AUDIT_HMAC_KEY = os.getenv("GOVERNOR_AUDIT_KEY", "").encode("utf-8")[:32]
+_AUDIT_STOP = object()  # queued by Governor.close() to stop the audit writer
 
 
 class RiskLevel(str, Enum):
@@ -43,6 +76,15 @@ class ActionType(str, Enum):
     STATE_TRANSITION = "state_transition"
 
 
+# Action types that count against the file-operation rate limit
+FILE_ACTIONS = frozenset((ActionType.FILE_READ, ActionType.FILE_WRITE, ActionType.FILE_DELETE))
+
+
+def _is_glob(pattern: str) -> bool:
+    """True if the pattern uses fnmatch wildcards."""
+    return any(c in pattern for c in "*?[")
+
+
 @dataclass
 class GovernorPolicy:
     """Defines guardrails for agent actions."""
@@ -91,6 +133,23 @@ class GovernorPolicy:
     # Rate limits
     llm_rate_limit: int = MAX_LLM_CALLS_PER_MINUTE
     file_rate_limit: int = MAX_FILE_OPS_PER_MINUTE
+    
+    def __post_init__(self):
+        # Literal patterns (".env", ".git/") are plain substring checks; only
+        # real globs are translated to regexes, once instead of on every check
+        self._blocked_literals = tuple(dict.fromkeys(
+            p.lower() for p in self.blocked_patterns if not _is_glob(p)
+        ))
+        self._blocked_globs = [
+            re.compile(fnmatch.translate(p.lower())) for p in self.blocked_patterns if _is_glob(p)
+        ]
+        # Pre-normalized command lists (tuple enables a single C-level startswith)
+        self._blocked_commands_lc = [c.lower() for c in self.blocked_commands]
+        self._allowed_commands_lc = tuple(c.lower() for c in self.allowed_commands)
+        # Each allowed path in both "./workspace/" and "workspace/" form
+        self._allowed_write_prefixes = tuple(dict.fromkeys(
+            prefix for base in self.allowed_write_paths for prefix in (base, base.replace("./", ""))
+        ))
 
 
 @dataclass
@@ -106,27 +165,49 @@ class AuditEntry:
     checksum: str = ""
     
     def __post_init__(self):
-        # Create tamper-evident checksum
-        content = f"{self.timestamp}{self.action_type}{self.agent_id}{self.action_detail}{self.decision}"
-        self.checksum = hashlib.sha256(content.encode()).hexdigest()[:16]
+        # Create tamper-evident checksum (keyed BLAKE2s: cheap on short input,
+        # and unforgeable without GOVERNOR_AUDIT_KEY when one is configured)
+        content = "\0".join((
+            self.timestamp, self.action_type.value, self.agent_id, self.action_detail, self.decision
+        )).encode("utf-8")
+        self.checksum = hashlib.blake2s(content, digest_size=8, key=AUDIT_HMAC_KEY).hexdigest()
+    
+    def to_dict(self) -> Dict[str, str]:
+        """Flat dict for serialization (avoids dataclasses.asdict's deep copy)."""
+        return {
+            "timestamp": self.timestamp,
+            "action_type": self.action_type.value,
+            "agent_id": self.agent_id,
+            "action_detail": self.action_detail,
+            "risk_level": self.risk_level.value,
+            "decision": self.decision,
+            "reason": self.reason,
+            "checksum": self.checksum,
+        }
 
 
 class RateLimiter:
-    """Thread-safe sliding window rate limiter."""
+    """Thread-safe sliding window rate limiter (monotonic nanosecond clock)."""
     
     def __init__(self, max_requests: int, window_seconds: int = 60):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests: List[float] = []
+        self.window_ns = window_seconds * 1_000_000_000
+        self.requests: Deque[int] = deque()
         self.lock = threading.Lock()
     
+    def _prune(self, now: int):
+        """Drop requests outside the window (oldest are always on the left)."""
+        requests, window_ns = self.requests, self.window_ns
+        while requests and now - requests[0] >= window_ns:
+            requests.popleft()
+    
     def is_allowed(self) -> bool:
         """Check if action is allowed under rate limit."""
+        now = time.monotonic_ns()
+        # Critical section covers only the deque operations
         with self.lock:
-            now = time.time()
-            # Remove old requests outside window
-            self.requests = [t for t in self.requests if now - t < self.window_seconds]
-            
+            self._prune(now)
             if len(self.requests) < self.max_requests:
                 self.requests.append(now)
                 return True
@@ -134,10 +215,118 @@ class RateLimiter:
     
     def remaining(self) -> int:
         """Get remaining requests in current window."""
+        now = time.monotonic_ns()
         with self.lock:
-            now = time.time()
-            self.requests = [t for t in self.requests if now - t < self.window_seconds]
-            return max(0, self.max_requests - len(self.requests))
+            self._prune(now)
+            count = len(self.requests)
+        return max(0, self.max_requests - count)
+
+
+# Atomic sliding window: prune expired entries, count, and admit in one round trip.
+# KEYS[1] = limiter key; ARGV = now_ms, window_ms, max_requests, unique member id
+SLIDING_WINDOW_LUA = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], 0, ARGV[1] - ARGV[2])
+local n = redis.call('ZCARD', KEYS[1])
+if n < tonumber(ARGV[3]) then
+    redis.call('ZADD', KEYS[1], ARGV[1], ARGV[1] .. ':' .. ARGV[4])
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+class RedisRateLimiter:
+    """
+    Sliding window rate limiter shared by every process using the same Redis key.
+    Falls back to an in-process RateLimiter whenever Redis errors.
+    """
+    
+    def __init__(self, client: "redis.Redis", key: str, max_requests: int, window_seconds: int = 60):
+        self.client = client
+        self.key = key
+        self.max_requests = max_requests
+        self.window_seconds = window_seconds
+        self.window_ms = window_seconds * 1000
+        self._script = client.register_script(SLIDING_WINDOW_LUA)
+        self._fallback = RateLimiter(max_requests, window_seconds)
+    
+    def is_allowed(self) -> bool:
+        """Check if action is allowed under the shared rate limit."""
+        try:
+            now_ms = int(time.time() * 1000)
+            return bool(self._script(
+                keys=[self.key],
+                args=[now_ms, self.window_ms, self.max_requests, uuid.uuid4().hex]
+            ))
+        except redis.RedisError:
+            return self._fallback.is_allowed()
+    
+    def remaining(self) -> int:
+        """Get remaining requests in current shared window."""
+        try:
+            now_ms = int(time.time() * 1000)
+            pipe = self.client.pipeline()
+            pipe.zremrangebyscore(self.key, 0, now_ms - self.window_ms)
+            pipe.zcard(self.key)
+            _, count = pipe.execute()
+            return max(0, self.max_requests - count)
+        except redis.RedisError:
+            return self._fallback.remaining()
+
+
+def _connect_redis() -> Optional["redis.Redis"]:
+    """Connect to GOVERNOR_REDIS_URL, or None to use per-process limiters."""
+    if not HAS_REDIS or not GOVERNOR_REDIS_URL:
+        return None
+    try:
+        client = redis.Redis.from_url(GOVERNOR_REDIS_URL)
+        client.ping()
+        return client
+    except redis.RedisError as e:
+        print(f"[Governor] Redis unavailable ({e}), using in-process rate limits")
+        return None
+
+
+def _specialize_risk_fns(policy: GovernorPolicy, automaton=None) -> Dict[str, Callable[[str], RiskLevel]]:
+    """
+    Generate shell-command and file-write risk functions with the policy inlined.
+    
+    Blocked substrings are unrolled into explicit `in` tests (or one automaton
+    scan) and the regexes/prefix tuples are bound as globals of the generated
+    code, so a check does no per-call interpretation of the policy.
+    """
+    ns: Dict[str, Any] = {
+        "LOW": RiskLevel.LOW, "MEDIUM": RiskLevel.MEDIUM,
+        "HIGH": RiskLevel.HIGH, "CRITICAL": RiskLevel.CRITICAL,
+        "ALLOWED_COMMANDS": policy._allowed_commands_lc,
+        "ALLOWED_PREFIXES": policy._allowed_write_prefixes,
+    }
+    lines = ["def _assess_shell(detail):", "    d = detail.lower()"]
+    if automaton is not None:
+        ns["_scan_blocked"] = automaton.iter
+        lines.append("    if next(_scan_blocked(d), None) is not None: return CRITICAL")
+    else:
+        for needle in policy._blocked_commands_lc:
+            lines.append(f"    if {needle!r} in d: return CRITICAL")
+    lines += [
+        "    if d.startswith(ALLOWED_COMMANDS): return LOW",
+        "    return HIGH",
+        "",
+        "def _assess_file_write(detail):",
+        "    d = detail.lower()",
+    ]
+    for literal in policy._blocked_literals:
+        lines.append(f"    if {literal!r} in d: return CRITICAL")
+    for i, regex in enumerate(policy._blocked_globs):
+        ns[f"_blocked_{i}"] = regex.match
+        lines.append(f"    if _blocked_{i}(d) is not None: return CRITICAL")
+    lines += [
+        "    if detail.startswith(ALLOWED_PREFIXES): return LOW",
+        "    return MEDIUM",
+    ]
+    exec(compile("\n".join(lines), "<governor-specialized>", "exec"), ns)
+    return {"shell": ns["_assess_shell"], "file_write": ns["_assess_file_write"]}
 
 
 class Governor:
@@ -153,56 +342,96 @@ class Governor:
     
     def __init__(self, policy: GovernorPolicy = None):
         self.policy = policy or GovernorPolicy()
-        self.llm_limiter = RateLimiter(self.policy.llm_rate_limit)
-        self.file_limiter = RateLimiter(self.policy.file_rate_limit)
-        self.pending_escalations: List[Dict] = []
+        self._redis = _connect_redis()
+        self.llm_limiter = self._make_limiter("gov:llm", self.policy.llm_rate_limit)
+        self.file_limiter = self._make_limiter("gov:file", self.policy.file_rate_limit)
+        # Escalations are stored column-wise; a row's index is its escalation id
+        self._esc_ts: List[str] = []
+        self._esc_action: List[str] = []
+        self._esc_agent: List[str] = []
+        self._esc_detail: List[str] = []
+        self._pending: set[int] = set()
+        self._rejected: set[int] = set()
+        self._compile_policy()
         
         # Ensure log directories exist
         os.makedirs(os.path.dirname(AUDIT_LOG_PATH), exist_ok=True)
+        
+        # Audit entries are queued and written in batches by a background
+        # thread, keeping disk I/O off the check_action critical path
+        self._audit_fd = os.open(AUDIT_LOG_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o640)
+        self._audit_q: "queue.Queue[AuditEntry]" = queue.Queue(maxsize=AUDIT_QUEUE_SIZE)
+        self._audit_lock = threading.Lock()
+        self._audit_dropped = 0
+        self._closed = False
+        self._audit_thread = threading.Thread(target=self._audit_drain, name="governor-audit", daemon=True)
+        self._audit_thread.start()
+        atexit.register(self.close)
+    
+    def _make_limiter(self, key: str, max_requests: int):
+        """Use a Redis-backed limiter when configured, else an in-process one."""
+        if self._redis is not None:
+            return RedisRateLimiter(self._redis, key, max_requests)
+        return RateLimiter(max_requests)
+    
+    def set_policy(self, policy: GovernorPolicy):
+        """Swap the active policy and regenerate the risk rules derived from it."""
+        self.policy = policy
+        self._compile_policy()
+    
+    def _compile_policy(self):
+        """Build the per-action-type risk table for the current policy."""
+        # One-pass scanner for all blocked shell substrings (None = unrolled checks)
+        automaton = self._build_automaton(self.policy._blocked_commands_lc)
+        specialized = _specialize_risk_fns(self.policy, automaton)
+        # Only the pattern-matching rules are memoized (commands and paths repeat);
+        # the rest are constant-time, and caching LLM prompts would just pin them.
+        # A fresh cache per compile means a policy swap can never serve stale results.
+        memoize = lru_cache(maxsize=CLASSIFY_CACHE_SIZE)
+        # Unlisted action types fall back to _risk_default
+        self._risk_fns: Dict[ActionType, Callable[[str], RiskLevel]] = {
+            ActionType.FILE_DELETE: self._risk_high,
+            ActionType.SHELL_COMMAND: memoize(specialized["shell"]),
+            ActionType.FILE_WRITE: memoize(specialized["file_write"]),
+            ActionType.LLM_CALL: self._risk_low,
+            ActionType.HTTP_REQUEST: self._risk_http,
+        }
     
     def assess_risk(self, action_type: ActionType, detail: str) -> RiskLevel:
         """Assess the risk level of an action."""
-        
-        # File deletion is always high risk
-        if action_type == ActionType.FILE_DELETE:
-            return RiskLevel.HIGH
-        
-        # Shell commands need careful review
-        if action_type == ActionType.SHELL_COMMAND:
-            for blocked in self.policy.blocked_commands:
-                if blocked.lower() in detail.lower():
-                    return RiskLevel.CRITICAL
-            for allowed in self.policy.allowed_commands:
-                if detail.lower().startswith(allowed.lower()):
-                    return RiskLevel.LOW
-            return RiskLevel.HIGH
-        
-        # File writes - check path whitelisting
-        if action_type == ActionType.FILE_WRITE:
-            for blocked in self.policy.blocked_patterns:
-                if self._match_pattern(blocked, detail):
-                    return RiskLevel.CRITICAL
-            for allowed in self.policy.allowed_write_paths:
-                if detail.startswith(allowed) or detail.startswith(allowed.replace("./", "")):
-                    return RiskLevel.LOW
-            return RiskLevel.MEDIUM
-        
+        return self._risk_fns.get(action_type, self._risk_default)(detail)
+    
+    @staticmethod
+    def _risk_low(detail: str) -> RiskLevel:
         # LLM calls are generally low risk
-        if action_type == ActionType.LLM_CALL:
+        return RiskLevel.LOW
+    
+    @staticmethod
+    def _risk_high(detail: str) -> RiskLevel:
+        # File deletion is always high risk
+        return RiskLevel.HIGH
+    
+    @staticmethod
+    def _risk_default(detail: str) -> RiskLevel:
+        return RiskLevel.MEDIUM
+    
+    @staticmethod
+    def _risk_http(detail: str) -> RiskLevel:
+        """HTTP requests need review unless they stay on this machine."""
+        if "localhost" in detail or "127.0.0.1" in detail:
             return RiskLevel.LOW
-        
-        # HTTP requests need review
-        if action_type == ActionType.HTTP_REQUEST:
-            if "localhost" in detail or "127.0.0.1" in detail:
-                return RiskLevel.LOW
-            return RiskLevel.MEDIUM
-        
         return RiskLevel.MEDIUM
     
-    def _match_pattern(self, pattern: str, path: str) -> bool:
-        """Simple glob-like pattern matching."""
-        import fnmatch
-        return fnmatch.fnmatch(path.lower(), pattern.lower())
+    @staticmethod
+    def _build_automaton(needles: List[str]):
+        """Build an Aho-Corasick automaton over lowercased needles, if available."""
+        if not HAS_AHOCORASICK or not needles:
+            return None
+        automaton = ahocorasick.Automaton()
+        for needle in needles:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        return automaton
     
     def check_action(
         self,
@@ -217,7 +446,8 @@ class Governor:
             (allowed: bool, reason: str)
         """
         risk = self.assess_risk(action_type, detail)
-        timestamp = datetime.utcnow().isoformat()
+        timestamp = datetime.utcnow().isoformat(timespec="milliseconds")
+        detail_short = detail[:100]
         
         # Rate limiting
         if action_type == ActionType.LLM_CALL:
@@ -226,20 +456,20 @@ class Governor:
                     timestamp=timestamp,
                     action_type=action_type,
                     agent_id=agent_id,
-                    action_detail=detail[:100],
+                    action_detail=detail_short,
                     risk_level=risk,
                     decision="REJECTED",
                     reason="Rate limit exceeded"
                 ))
                 return False, "LLM rate limit exceeded. Wait before retrying."
         
-        if action_type in [ActionType.FILE_READ, ActionType.FILE_WRITE, ActionType.FILE_DELETE]:
+        if action_type in FILE_ACTIONS:
             if not self.file_limiter.is_allowed():
                 self._log_audit(AuditEntry(
                     timestamp=timestamp,
                     action_type=action_type,
                     agent_id=agent_id,
-                    action_detail=detail[:100],
+                    action_detail=detail_short,
                     risk_level=risk,
                     decision="REJECTED",
                     reason="File operation rate limit exceeded"
@@ -252,7 +482,7 @@ class Governor:
                 timestamp=timestamp,
                 action_type=action_type,
                 agent_id=agent_id,
-                action_detail=detail[:100],
+                action_detail=detail_short,
                 risk_level=risk,
                 decision="REJECTED",
                 reason="Critical risk: Action blocked by policy"
@@ -262,18 +492,16 @@ class Governor:
         
         if risk == RiskLevel.HIGH:
             # Add to escalation queue
-            self.pending_escalations.append({
-                "timestamp": timestamp,
-                "action_type": action_type.value,
-                "agent_id": agent_id,
-                "detail": detail,
-                "status": "pending"
-            })
+            self._pending.add(len(self._esc_ts))
+            self._esc_ts.append(timestamp)
+            self._esc_action.append(action_type.value)
+            self._esc_agent.append(agent_id)
+            self._esc_detail.append(detail)
             self._log_audit(AuditEntry(
                 timestamp=timestamp,
                 action_type=action_type,
                 agent_id=agent_id,
-                action_detail=detail[:100],
+                action_detail=detail_short,
                 risk_level=risk,
                 decision="ESCALATED",
                 reason="High risk: Requires human approval"
@@ -285,7 +513,7 @@ class Governor:
             timestamp=timestamp,
             action_type=action_type,
             agent_id=agent_id,
-            action_detail=detail[:100],
+            action_detail=detail_short,
             risk_level=risk,
             decision="APPROVED",
             reason=f"Auto-approved: {risk.value} risk"
@@ -293,12 +521,89 @@ class Governor:
         return True, "Action approved."
     
     def _log_audit(self, entry: AuditEntry):
-        """Append to immutable audit log."""
+        """Queue an entry for the append-only audit log (dropped if the writer is behind)."""
         try:
-            with open(AUDIT_LOG_PATH, "a", encoding="utf-8") as f:
-                f.write(json.dumps(asdict(entry)) + "\n")
-        except Exception as e:
-            print(f"[Governor] Audit log error: {e}")
+            if self._closed:
+                raise queue.Full
+            self._audit_q.put_nowait(entry)
+        except queue.Full:
+            with self._audit_lock:
+                self._audit_dropped += 1
+    
+    def _audit_drain(self):
+        """Background writer: drain queued entries in batches, one flush per batch."""
+        stop = False
+        while not stop:
+            batch = [self._audit_q.get()]
+            while len(batch) < AUDIT_BATCH_SIZE:
+                try:
+                    batch.append(self._audit_q.get_nowait())
+                except queue.Empty:
+                    break
+            entries = [e for e in batch if e is not _AUDIT_STOP]
+            stop = len(entries) < len(batch)
+            try:
+                if entries:
+                    self._write_audit_lines([self._serialize_audit(e) for e in entries])
+            except Exception as e:
+                print(f"[Governor] Audit log error: {e}")
+            finally:
+                for _ in batch:
+                    self._audit_q.task_done()
+    
+    @staticmethod
+    def _serialize_audit(entry: AuditEntry) -> bytes:
+        """
+        One JSON line of at most AUDIT_ATOMIC_WRITE bytes: an oversized
+        action_detail is cut and the entry marked "truncated" (the checksum
+        still covers the full detail).
+        """
+        record = entry.to_dict()
+        line = json_dumps(record) + b"\n"
+        while len(line) > AUDIT_ATOMIC_WRITE and record["action_detail"]:
+            detail = record["action_detail"]
+            # Every character costs at least one byte, so this always shrinks the line
+            record["action_detail"] = detail[:max(len(detail) - (len(line) - AUDIT_ATOMIC_WRITE), 0)]
+            record["truncated"] = True
+            line = json_dumps(record) + b"\n"
+        return line
+    
+    def _write_audit_lines(self, lines: List[bytes]):
+        """
+        Append whole lines in chunks of at most AUDIT_ATOMIC_WRITE bytes, so
+        other processes appending to the same log never split a line.
+        """
+        chunk: List[bytes] = []
+        size = 0
+        for line in lines:
+            if chunk and size + len(line) > AUDIT_ATOMIC_WRITE:
+                self._write_all(b"".join(chunk))
+                chunk, size = [], 0
+            chunk.append(line)
+            size += len(line)
+        if chunk:
+            self._write_all(b"".join(chunk))
+    
+    def _write_all(self, data: bytes):
+        """os.write until every byte is out (a write may be short, e.g. on a full disk)."""
+        view = memoryview(data)
+        while view:
+            view = view[os.write(self._audit_fd, view):]
+    
+    def flush_audit(self):
+        """Block until every queued audit entry has been written."""
+        self._audit_q.join()
+    
+    def close(self):
+        """Write out queued audit entries, stop the writer thread and close the log."""
+        with self._audit_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._audit_q.put(_AUDIT_STOP)
+        self._audit_thread.join()
+        os.close(self._audit_fd)
+        atexit.unregister(self.close)
     
     def _log_rejection(self, action_type: ActionType, detail: str, agent_id: str, reason: str):
         """Log rejection to markdown file for human review."""
@@ -313,20 +618,32 @@ class Governor:
             print(f"[Governor] Reject log error: {e}")
     
     def get_pending_escalations(self) -> List[Dict]:
-        """Get all pending human approval requests."""
-        return [e for e in self.pending_escalations if e["status"] == "pending"]
+        """Get all pending human approval requests (index = id for approve/reject)."""
+        return [
+            {
+                "index": i,
+                "timestamp": self._esc_ts[i],
+                "action_type": self._esc_action[i],
+                "agent_id": self._esc_agent[i],
+                "detail": self._esc_detail[i],
+                "status": "pending"
+            }
+            for i in sorted(self._pending)
+        ]
     
     def approve_escalation(self, index: int) -> bool:
         """Human approves a pending escalation."""
-        if 0 <= index < len(self.pending_escalations):
-            self.pending_escalations[index]["status"] = "approved"
+        if 0 <= index < len(self._esc_ts):
+            self._pending.discard(index)
+            self._rejected.discard(index)
             return True
         return False
     
     def reject_escalation(self, index: int) -> bool:
         """Human rejects a pending escalation."""
-        if 0 <= index < len(self.pending_escalations):
-            self.pending_escalations[index]["status"] = "rejected"
+        if 0 <= index < len(self._esc_ts):
+            self._pending.discard(index)
+            self._rejected.add(index)
             return True
         return False
     
@@ -335,7 +652,8 @@ class Governor:
         return {
             "llm_remaining": self.llm_limiter.remaining(),
             "file_ops_remaining": self.file_limiter.remaining(),
-            "pending_escalations": len(self.get_pending_escalations()),
+            "pending_escalations": len(self._pending),
+            "audit_dropped": self._audit_dropped,
             "policy": {
                 "llm_rate_limit": self.policy.llm_rate_limit,
                 "file_rate_limit": self.policy.file_rate_limit,
@@ -348,6 +666,8 @@ class Governor:
 def governed(action_type: ActionType, detail_extractor: Callable = None):
     """
     Decorator to wrap functions with Governor checks.
+    All governed functions share the process-wide Governor (get_governor()),
+    so rate limits and escalations accumulate across every call site.
     
     Usage:
         @governed(ActionType.FILE_WRITE, lambda args: args[0])
@@ -357,7 +677,7 @@ def governed(action_type: ActionType, detail_extractor: Callable = None):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            gov = Governor()
+            gov = get_governor()
             detail = detail_extractor(args) if detail_extractor else str(args)
             allowed, reason = gov.check_action(action_type, detail)
             
@@ -371,13 +691,16 @@ def governed(action_type: ActionType, detail_extractor: Callable = None):
 
 # --- SINGLETON INSTANCE ---
 _governor_instance: Optional[Governor] = None
+_governor_lock = threading.Lock()
 
 
 def get_governor() -> Governor:
-    """Get or create the singleton Governor instance."""
+    """Get or create the singleton Governor instance (thread-safe)."""
     global _governor_instance
     if _governor_instance is None:
-        _governor_instance = Governor()
+        with _governor_lock:
+            if _governor_instance is None:
+                _governor_instance = Governor()
     return _governor_instance
 
 
@@ -397,8 +720,8 @@ if __name__ == "__main__":
     if cmd == "escalations":
         escalations = gov.get_pending_escalations()
         if escalations:
-            for i, e in enumerate(escalations):
-                print(f"[{i}] {e['action_type']}: {e['detail'][:50]}...")
+            for e in escalations:
+                print(f"[{e['index']}] {e['action_type']}: {e['detail'][:50]}...")
         else:
             print("No pending escalations.")
     
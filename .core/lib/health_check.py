@@ -8,12 +8,22 @@ Usage:
     
 Endpoints:
     GET /health - Returns JSON with all service statuses
+    GET /health?fresh=1 - Same, bypassing the result cache
 """
 
-import json
-from http.server import HTTPServer, BaseHTTPRequestHandler
+import time
+import asyncio
+import threading
+from urllib.parse import urlsplit, parse_qs
+from typing import Optional
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
 import httpx
 
+try:
+    from .json_utils import dumps as json_dumps
+except ImportError:
+    from json_utils import dumps as json_dumps
+
 # Service configuration
 SERVICES = {
     "memory_server": {"url": "http://localhost:8000/state", "port": 8000},
@@ -23,12 +33,42 @@ SERVICES = {
 }
 
 HEALTH_CHECK_PORT = 8080
+HEALTH_CACHE_TTL = 0.5  # seconds; absorbs bursts of probes from many pollers
+
+# Probes run on one background event loop that owns a shared, keep-alive
+# AsyncClient; handler threads submit work to it instead of creating loops.
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_client: Optional[httpx.AsyncClient] = None
+_cache = {"ts": 0.0, "data": None}
+_cache_lock = asyncio.Lock()
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Get or start the background event loop."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="health-check-loop", daemon=True).start()
+    return _loop
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Get or create the shared AsyncClient (only called on the background loop)."""
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=2.0,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32),
+        )
+    return _client
 
 
-def check_service(name: str, config: dict) -> dict:
+async def check_service(name: str, config: dict) -> dict:
     """Check if a service is healthy."""
     try:
-        r = httpx.get(config["url"], timeout=2.0)
+        r = await _get_client().get(config["url"])
         return {
             "name": name,
             "status": "healthy" if r.status_code == 200 else "unhealthy",
@@ -51,16 +91,21 @@ def check_service(name: str, config: dict) -> dict:
         }
 
 
-def get_all_health() -> dict:
-    """Get health status of all services."""
-    results = {}
-    healthy_count = 0
-    
-    for name, config in SERVICES.items():
-        status = check_service(name, config)
-        results[name] = status
-        if status["status"] == "healthy":
-            healthy_count += 1
+async def get_all_health(fresh: bool = False) -> dict:
+    """Get health status of all services, reusing a result younger than HEALTH_CACHE_TTL."""
+    async with _cache_lock:
+        if not fresh and _cache["data"] and time.monotonic() - _cache["ts"] < HEALTH_CACHE_TTL:
+            return _cache["data"]
+        _cache["data"] = await _probe_all()
+        _cache["ts"] = time.monotonic()
+        return _cache["data"]
+
+
+async def _probe_all() -> dict:
+    """Probe all services concurrently."""
+    statuses = await asyncio.gather(*(check_service(name, config) for name, config in SERVICES.items()))
+    results = {status["name"]: status for status in statuses}
+    healthy_count = sum(1 for status in statuses if status["status"] == "healthy")
     
     return {
         "overall": "healthy" if healthy_count == len(SERVICES) else "degraded" if healthy_count > 0 else "offline",
@@ -70,18 +115,25 @@ def get_all_health() -> dict:
     }
 
 
+def get_all_health_sync(fresh: bool = False) -> dict:
+    """Blocking wrapper around get_all_health for synchronous callers."""
+    return asyncio.run_coroutine_threadsafe(get_all_health(fresh), _get_loop()).result()
+
+
 class HealthCheckHandler(BaseHTTPRequestHandler):
     """HTTP handler for health check requests."""
     
     def do_GET(self):
-        if self.path == "/health" or self.path == "/":
-            health = get_all_health()
+        url = urlsplit(self.path)
+        if url.path == "/health" or url.path == "/":
+            fresh = parse_qs(url.query).get("fresh", ["0"])[0] not in ("", "0", "false")
+            health = get_all_health_sync(fresh)
             
             self.send_response(200 if health["overall"] == "healthy" else 503)
             self.send_header("Content-Type", "application/json")
             self.send_header("Access-Control-Allow-Origin", "*")
             self.end_headers()
-            self.wfile.write(json.dumps(health, indent=2).encode())
+            self.wfile.write(json_dumps(health, indent=True))
         else:
             self.send_response(404)
             self.send_header("Content-Type", "text/plain")
@@ -95,7 +147,7 @@ class HealthCheckHandler(BaseHTTPRequestHandler):
 
 def run_server():
     """Run the health check server."""
-    server = HTTPServer(("", HEALTH_CHECK_PORT), HealthCheckHandler)
+    server = ThreadingHTTPServer(("", HEALTH_CHECK_PORT), HealthCheckHandler)
     print(f"🏥 Health Check Server running on http://localhost:{HEALTH_CHECK_PORT}/health")
     print("Press Ctrl+C to stop")
     
@@ -0,0 +1,53 @@
+"""
+JSON Helpers
+============
+Fast JSON encode/decode for Studio Mode clients.
+Uses orjson (C, SIMD-accelerated) when installed, stdlib json otherwise.
+"""
+
+import json
+from typing import Any, Dict, Union
+
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+JSON_HEADERS = {"Content-Type": "application/json"}
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Encode an object to UTF-8 JSON bytes (optionally indented by 2)."""
+    if HAS_ORJSON:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Decode a JSON document."""
+    if HAS_ORJSON:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def parse_metadata(value: Any) -> Dict[str, Any]:
+    """
+    Normalize a task's metadata field to a dict.
+    The Memory Server stores metadata as a JSON string; already-decoded
+    dicts are passed through without a second parse.
+    """
+    if not value:
+        return {}
+    if isinstance(value, dict):
+        return value
+    return loads(value)
+
+
+def post_json(client, url: str, payload: Any, **kwargs):
+    """
+    POST `payload` as a pre-encoded JSON body.
+    Works with both httpx.Client and httpx.AsyncClient (await the result).
+    """
+    return client.post(url, content=dumps(payload), headers=JSON_HEADERS, **kwargs)
@@ -6,9 +6,13 @@ Integrates with the Memory Server for state persistence and task management.
 """
 
 import os
+import re
 import json
+import asyncio
+import hashlib
 import httpx
-from typing import TypedDict, Annotated, Literal, Optional
+from collections import OrderedDict
+from typing import TypedDict, Annotated, Literal, Optional, Dict, Tuple
 from enum import Enum
 
 # LangGraph imports
@@ -18,15 +22,37 @@ from langgraph.graph.message import add_messages
 # LiteLLM for model abstraction
 import litellm
 
+# Persistent prompt cache is optional (pip install diskcache)
+try:
+    import diskcache
+    HAS_DISKCACHE = True
+except ImportError:
+    HAS_DISKCACHE = False
+
+# HTTP/2 support is optional (pip install 'httpx[http2]')
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
 # --- CONFIGURATION ---
 
 # --- CONFIGURATION ---
 try:
-    from ..config import MEMORY_SERVER_URL, DEFAULT_MODEL
+    from ..config import (
+        MEMORY_SERVER_URL, DEFAULT_MODEL, LLM_CACHE_DIR,
+        LLM_CACHE_ENABLED, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES
+    )
+    from .json_utils import post_json
 except ImportError:
     import sys
     sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
-    from .core.config import MEMORY_SERVER_URL, DEFAULT_MODEL
+    from .core.config import (
+        MEMORY_SERVER_URL, DEFAULT_MODEL, LLM_CACHE_DIR,
+        LLM_CACHE_ENABLED, LLM_CACHE_TTL, LLM_CACHE_MAX_BYTES
+    )
+    from .core.lib.json_utils import post_json
 
 
 # --- STATE DEFINITION ---
@@ -51,104 +77,349 @@ class HiveState(TypedDict):
 
 
 # --- MEMORY SERVER CLIENT ---
+# All MemoryClient instances share one keep-alive pool, so graph nodes don't
+# pay a new TCP handshake per call. An AsyncClient is tied to the event loop
+# it was created on, so a new loop (e.g. another run_hive_loop) gets a new one.
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get or create the HTTP client for the running event loop."""
+    global _shared_client, _shared_client_loop
+    loop = asyncio.get_running_loop()
+    if _shared_client is None or _shared_client.is_closed or _shared_client_loop is not loop:
+        _shared_client = httpx.AsyncClient(
+            http2=HAS_HTTP2,
+            timeout=30.0,
+            limits=httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+        )
+        _shared_client_loop = loop
+    return _shared_client
+
+
+async def close_shared_client():
+    """Close the shared HTTP client (call before the event loop exits)."""
+    global _shared_client, _shared_client_loop
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+        _shared_client_loop = None
+
+
 class MemoryClient:
-    """HTTP client for interacting with the Memory Server."""
+    """Async HTTP client for interacting with the Memory Server."""
     
     def __init__(self, base_url: str = MEMORY_SERVER_URL):
         self.base_url = base_url
-        self.client = httpx.Client(timeout=30.0)
     
-    def get_state(self) -> AgentState:
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared pooled client for the running event loop."""
+        return get_shared_client()
+    
+    async def get_state(self) -> AgentState:
         """Get current system state."""
-        resp = self.client.get(f"{self.base_url}/state")
+        resp = await self.client.get(f"{self.base_url}/state")
         return AgentState(resp.json()["current_state"])
     
-    def update_state(self, new_state: AgentState) -> dict:
+    async def update_state(self, new_state: AgentState) -> dict:
         """Transition to a new state."""
-        resp = self.client.post(
+        resp = await post_json(
+            self.client,
             f"{self.base_url}/state/update",
-            json={"new_state": new_state.value}
+            {"new_state": new_state.value}
         )
         resp.raise_for_status()
         return resp.json()
     
-    def get_pending_tasks(self, assignee: str = "engineer") -> list:
+    async def get_pending_tasks(self, assignee: str = "engineer") -> list:
         """Get pending tasks for an assignee."""
-        resp = self.client.get(
+        resp = await self.client.get(
             f"{self.base_url}/tasks/list",
             params={"status": "pending", "assignee": assignee}
         )
         return resp.json().get("tasks", [])
     
-    def claim_task(self, task_id: str, agent_id: str) -> dict:
+    async def claim_task(self, task_id: str, agent_id: str) -> dict:
         """Claim a task for execution."""
-        resp = self.client.post(
+        resp = await post_json(
+            self.client,
             f"{self.base_url}/tasks/claim",
-            json={"task_id": task_id, "agent_id": agent_id}
+            {"task_id": task_id, "agent_id": agent_id}
         )
         resp.raise_for_status()
         return resp.json()
     
-    def update_task(self, task_id: str, status: str, metadata: dict = None) -> dict:
+    async def update_task(self, task_id: str, status: str, metadata: dict = None) -> dict:
         """Update task status and metadata."""
-        resp = self.client.post(
+        resp = await post_json(
+            self.client,
             f"{self.base_url}/tasks/update",
-            json={"task_id": task_id, "status": status, "metadata": metadata or {}}
+            {"task_id": task_id, "status": status, "metadata": metadata or {}}
         )
         resp.raise_for_status()
         return resp.json()
     
-    def add_memory(self, text: str, mem_type: str = "episodic", metadata: dict = None) -> dict:
+    async def add_memory(self, text: str, mem_type: str = "episodic", metadata: dict = None) -> dict:
         """Add a memory entry."""
-        resp = self.client.post(
+        resp = await post_json(
+            self.client,
             f"{self.base_url}/memory/add",
-            json={"text": text, "type": mem_type, "metadata": metadata or {}}
+            {"text": text, "type": mem_type, "metadata": metadata or {}}
         )
         return resp.json()
     
-    def query_memory(self, query: str, limit: int = 5, filter_type: str = None) -> list:
+    async def query_memory(self, query: str, limit: int = 5, filter_type: str = None) -> list:
         """Query memory for relevant context."""
         payload = {"text": query, "limit": limit}
         if filter_type:
             payload["filter_type"] = filter_type
-        resp = self.client.post(f"{self.base_url}/memory/query", json=payload)
+        resp = await post_json(self.client, f"{self.base_url}/memory/query", payload)
         return resp.json().get("results", [])
     
-    def write_file(self, path: str, content: str) -> dict:
+    async def write_file(self, path: str, content: str) -> dict:
         """Write a file to workspace."""
-        resp = self.client.post(
+        resp = await post_json(
+            self.client,
             f"{self.base_url}/fs/write",
-            json={"path": path, "content": content}
+            {"path": path, "content": content}
+        )
+        resp.raise_for_status()
+        return resp.json()
+    
+    async def claim_and_context(
+        self,
+        assignee: str,
+        agent_id: str,
+        query_limit: int = 3,
+        filter_type: str = "knowledge"
+    ) -> dict:
+        """
+        Claim the next pending task, move to EXECUTING, and fetch its memory
+        context in one round trip. Returns {task, context, new_state}.
+        """
+        resp = await post_json(
+            self.client,
+            f"{self.base_url}/tasks/claim_and_context",
+            {
+                "assignee": assignee,
+                "agent_id": agent_id,
+                "query_limit": query_limit,
+                "filter_type": filter_type
+            }
         )
         resp.raise_for_status()
         return resp.json()
+    
+    async def finish_task(
+        self,
+        task_id: str,
+        status: str,
+        metadata: dict = None,
+        next_state: AgentState = None,
+        result_path: str = None,
+        result: str = None,
+        memory_text: str = None,
+        memory_metadata: dict = None
+    ) -> dict:
+        """
+        Write the result file (if any), transition state, update the task and
+        record an episodic memory in one round trip.
+        """
+        payload = {
+            "task_id": task_id,
+            "status": status,
+            "metadata": metadata or {},
+            "memory_text": memory_text,
+            "memory_metadata": memory_metadata or {}
+        }
+        if next_state is not None:
+            payload["next_state"] = next_state.value
+        if result_path is not None:
+            payload["file_path"] = result_path
+            payload["file_content"] = result
+        resp = await post_json(self.client, f"{self.base_url}/tasks/finish", payload)
+        resp.raise_for_status()
+        return resp.json()
+
+
+# Shared by every graph node; construction is cheap and connects lazily
+_CLIENT = MemoryClient()
+
+
+# --- LLM PROMPT CACHE ---
+PROMPT_CACHE_SIZE = 256
+PROMPT_CACHE_WARM_ENTRIES = 100  # most recent disk entries loaded at startup
+
+
+class PromptCache:
+    """
+    LRU of LLM completions keyed by a digest of the model, token budget and
+    exact messages, so a repeated prompt skips the LLM call. With a
+    `directory` (and diskcache installed) entries also persist across runs
+    for `ttl` seconds, in at most `size_limit` bytes; memory misses fall
+    through to disk.
+    """
+    
+    def __init__(
+        self,
+        maxsize: int = PROMPT_CACHE_SIZE,
+        directory: Optional[str] = None,
+        ttl: Optional[float] = None,
+        size_limit: int = LLM_CACHE_MAX_BYTES
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, str]" = OrderedDict()
+        self._disk = None
+        if directory and HAS_DISKCACHE:
+            try:
+                self._disk = diskcache.Cache(directory, size_limit=size_limit)
+                self._warm()
+            except Exception as e:
+                print(f"[PromptCache] Disk cache unavailable ({e}), using memory only")
+                self._disk = None
+    
+    def _warm(self):
+        """Load the most recently written disk entries into memory."""
+        recent = []
+        for key in reversed(self._disk):
+            if len(recent) >= min(self.maxsize, PROMPT_CACHE_WARM_ENTRIES):
+                break
+            content = self._disk.get(key)
+            if content is not None:
+                recent.append((key, content))
+        for key, content in reversed(recent):
+            self._entries[key] = content
+    
+    @staticmethod
+    def make_key(model: str, messages: list, max_tokens: int) -> bytes:
+        h = hashlib.blake2b(f"{model}\0{max_tokens}".encode("utf-8"), digest_size=16)
+        for message in messages:
+            h.update(b"\0" + message["role"].encode("utf-8") + b"\0")
+            # Verbatim: prompts embed code, where whitespace is significant
+            h.update(message["content"].encode("utf-8"))
+        return h.digest()
+    
+    def get(self, key: bytes) -> Optional[str]:
+        content = self._entries.get(key)
+        if content is not None:
+            self._entries.move_to_end(key)
+        elif self._disk is not None:
+            content = self._disk.get(key)
+            if content is not None:
+                self._remember(key, content)
+        return content
+    
+    def put(self, key: bytes, content: str):
+        self._remember(key, content)
+        if self._disk is not None:
+            self._disk.set(key, content, expire=self.ttl)
+    
+    def _remember(self, key: bytes, content: str):
+        self._entries[key] = content
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+# LLM_CACHE=off disables caching entirely (in-flight requests are still shared)
+_prompt_cache = (
+    PromptCache(directory=LLM_CACHE_DIR, ttl=LLM_CACHE_TTL) if LLM_CACHE_ENABLED
+    else PromptCache(maxsize=0)
+)
+# Completions currently being generated, so identical requests share one LLM call
+_inflight: Dict[bytes, "asyncio.Task[str]"] = {}
+
+
+async def _complete(key: bytes, model: str, messages: list, max_tokens: int) -> str:
+    response = await litellm.acompletion(model=model, messages=messages, max_tokens=max_tokens)
+    content = response.choices[0].message.content
+    _prompt_cache.put(key, content)
+    return content
+
+
+def _completion_task(key: bytes, model: str, messages: list, max_tokens: int) -> "asyncio.Task[str]":
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_complete(key, model, messages, max_tokens))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    return task
+
+
+async def cached_completion(messages: list, max_tokens: int, model: str = DEFAULT_MODEL) -> str:
+    """
+    Return the completion text for `messages`, reusing a cached answer or
+    joining an identical in-flight request (e.g. one started by prefetch_completion).
+    """
+    key = PromptCache.make_key(model, messages, max_tokens)
+    content = _prompt_cache.get(key)
+    if content is not None:
+        return content
+    # Shielded so one cancelled waiter doesn't cancel the call for the others
+    return await asyncio.shield(_completion_task(key, model, messages, max_tokens))
+
+
+def prefetch_completion(messages: list, max_tokens: int, model: str = DEFAULT_MODEL) -> Optional["asyncio.Task[str]"]:
+    """
+    Start generating a completion in the background without waiting for it.
+    Returns the task (None if already cached) so the caller can cancel it.
+    """
+    key = PromptCache.make_key(model, messages, max_tokens)
+    if _prompt_cache.get(key) is not None:
+        return None
+    task = _completion_task(key, model, messages, max_tokens)
+    # Nobody may end up awaiting a prefetch; a later request simply retries
+    task.add_done_callback(_consume_exception)
+    return task
+
+
+def _consume_exception(task: asyncio.Task):
+    if not task.cancelled():
+        task.exception()
+
+
+# --- PROMPT SIZE LIMITS ---
+# Prompt size drives LLM latency and cost, so memory context and Engineer
+# output are capped before they're sent.
+MAX_CONTEXT_CHARS = 4000
+MAX_RESULT_CHARS = 8000
+
+
+def _head_tail(text: str, limit: int) -> str:
+    """Shorten `text` to about `limit` chars, keeping its start and end."""
+    if len(text) <= limit:
+        return text
+    half = limit // 2
+    omitted = len(text) - 2 * half
+    return f"{text[:half]}\n... [{omitted} chars omitted] ...\n{text[-half:]}"
 
 
 # --- AGENT NODES ---
-def fetch_task_node(state: HiveState) -> HiveState:
+# Nodes are coroutines (run via graph.ainvoke) and only make non-blocking calls.
+# Each node returns only the keys it changes; LangGraph merges them into state.
+async def fetch_task_node(state: HiveState) -> dict:
     """
     IDLE → EXECUTING transition node.
     Fetches the next pending task from the queue.
     """
-    client = MemoryClient()
-    tasks = client.get_pending_tasks(assignee="engineer")
+    client = _CLIENT
+    # Claim the first pending task, enter EXECUTING and gather context in one call
+    claimed = await client.claim_and_context(assignee="engineer", agent_id="engineer_agent", query_limit=3)
+    task = claimed.get("task")
     
-    if not tasks:
+    if not task:
         # No tasks available, remain idle
-        return {**state, "task_id": None, "task_text": None}
-    
-    # Claim the first pending task
-    task = tasks[0]
-    print(f"[fetch] Claiming task: {task['id']}")
-    client.claim_task(task["id"], agent_id="engineer_agent")
-    client.update_state(AgentState.EXECUTING)
+        return {"task_id": None, "task_text": None}
     
-    # Gather context from memory
-    context_results = client.query_memory(task["text"], limit=3, filter_type="knowledge")
-    context = "\n".join([r.get("text", "") for r in context_results])
+    print(f"[fetch] Claimed task: {task['id']}")
+    context = "\n".join([r.get("text", "") for r in claimed.get("context", [])])
+    # Results come most relevant first, so keep the head
+    context = context[:MAX_CONTEXT_CHARS]
     
     return {
-        **state,
         "current_phase": AgentState.EXECUTING,
         "task_id": task["id"],
         "task_text": task["text"],
@@ -158,14 +429,14 @@ def fetch_task_node(state: HiveState) -> HiveState:
     }
 
 
-def engineer_node(state: HiveState) -> HiveState:
+async def engineer_node(state: HiveState) -> dict:
     """
     EXECUTING node: The Engineer Agent generates code based on the task.
     """
     if not state.get("task_text"):
-        return state
+        return {}
     
-    client = MemoryClient()
+    client = _CLIENT
     
     # Build the prompt
     system_prompt = """You are the C.O.R.E. Engineer, a specialized code generation agent.
@@ -189,8 +460,7 @@ Previous Critique (if any):
 Generate the code to complete this task."""
 
     # Call LLM
-    response = litellm.completion(
-        model=DEFAULT_MODEL,
+    result = await cached_completion(
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt}
@@ -198,39 +468,40 @@ Generate the code to complete this task."""
         max_tokens=2000
     )
     
-    result = response.choices[0].message.content
+    # Start the Critic's evaluation now so it overlaps the save and the graph
+    # transition; critic_node joins the in-flight call instead of starting over
+    prefetch = None
+    if not _is_trivial_result(result):
+        prefetch = prefetch_completion(_critic_messages(state["task_text"], result), CRITIC_MAX_TOKENS)
     
-    # Save result to workspace
+    # Save result to workspace and transition to REVIEW
     output_path = f"agent_output/{state['task_id'][:8]}_result.txt"
-    client.write_file(output_path, result)
-    
-    # Transition to REVIEW
-    client.update_state(AgentState.REVIEW)
-    client.update_task(state["task_id"], status="review", metadata={"result_path": output_path})
-    
-    client.add_memory(
-        text=f"Engineer completed task {state['task_id'][:8]}: {state['task_text'][:50]}...",
-        mem_type="episodic",
-        metadata={"task_id": state["task_id"], "output_path": output_path}
-    )
+    try:
+        await client.finish_task(
+            state["task_id"],
+            status="review",
+            metadata={"result_path": output_path},
+            next_state=AgentState.REVIEW,
+            result_path=output_path,
+            result=result,
+            memory_text=f"Engineer completed task {state['task_id'][:8]}: {state['task_text'][:50]}...",
+            memory_metadata={"task_id": state["task_id"], "output_path": output_path}
+        )
+    except BaseException:
+        # No review will follow, so don't pay for the Critic's call
+        if prefetch is not None:
+            prefetch.cancel()
+        raise
     
     return {
-        **state,
         "current_phase": AgentState.REVIEW,
         "result": result
     }
 
 
-def critic_node(state: HiveState) -> HiveState:
-    """
-    REVIEW node: The Critic Agent evaluates the Engineer's output.
-    """
-    if not state.get("result"):
-        return state
-    
-    client = MemoryClient()
-    
-    system_prompt = """You are the Critic, a specialized QA agent.
+CRITIC_MAX_TOKENS = 500
+
+CRITIC_SYSTEM_PROMPT = """You are the Critic, a specialized QA agent.
 Your role is to validate the output of the Engineer agent.
 
 Evaluation Criteria:
@@ -245,37 +516,81 @@ SCORE: 1-10
 ISSUES: (list any issues, or "None")
 SUGGESTIONS: (list improvements, or "None")"""
 
-    user_prompt = f"""Task: {state['task_text']}
+_VERDICT_RE = re.compile(r"VERDICT:\s*(PASS|FAIL)", re.IGNORECASE)
+_SCORE_RE = re.compile(r"SCORE:\s*(\d+)", re.IGNORECASE)
+
+
+def _parse_critique(critique: str) -> Tuple[bool, Optional[int]]:
+    """Extract (passed, score) from a Critic reply; a missing verdict counts as a fail."""
+    verdict = _VERDICT_RE.search(critique)
+    score = _SCORE_RE.search(critique)
+    return (
+        verdict is not None and verdict.group(1).upper() == "PASS",
+        int(score.group(1)) if score else None
+    )
+
+
+# Short outputs with no function or class definitions are passed without an
+# LLM review; there's too little there for the Critic to find fault with.
+TRIVIAL_RESULT_CHARS = 200
+TRIVIAL_RESULT_LINES = 5
+TRIVIAL_CRITIQUE = "VERDICT: PASS\nSCORE: 8\nISSUES: None\nSUGGESTIONS: None"
+_DEFINITION_RE = re.compile(r"^\s*(?:async\s+def|def|class|function|interface)\b", re.MULTILINE)
+
+
+def _is_trivial_result(result: str) -> bool:
+    """Cheap check for outputs too small to need the Critic's LLM call."""
+    return (
+        len(result) < TRIVIAL_RESULT_CHARS
+        and result.count("\n") < TRIVIAL_RESULT_LINES
+        and not _DEFINITION_RE.search(result)
+    )
+
+
+def _critic_messages(task_text: str, result: str) -> list:
+    """Build the Critic's chat messages for an Engineer result (capped to MAX_RESULT_CHARS)."""
+    user_prompt = f"""Task: {task_text}
 
 Engineer's Output:
 ```
-{state['result']}
+{_head_tail(result, MAX_RESULT_CHARS)}
 ```
 
 Evaluate this output against the task requirements."""
+    return [
+        {"role": "system", "content": CRITIC_SYSTEM_PROMPT},
+        {"role": "user", "content": user_prompt}
+    ]
 
-    response = litellm.completion(
-        model=DEFAULT_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": user_prompt}
-        ],
-        max_tokens=500
-    )
+
+async def critic_node(state: HiveState) -> dict:
+    """
+    REVIEW node: The Critic Agent evaluates the Engineer's output.
+    """
+    if not state.get("result"):
+        return {}
     
-    critique = response.choices[0].message.content
-    passed = "VERDICT: PASS" in critique.upper()
+    client = _CLIENT
+    
+    if _is_trivial_result(state["result"]):
+        critique = TRIVIAL_CRITIQUE
+    else:
+        critique = await cached_completion(
+            messages=_critic_messages(state["task_text"], state["result"]),
+            max_tokens=CRITIC_MAX_TOKENS
+        )
+    passed, score = _parse_critique(critique)
     
     if passed or state.get("iteration", 0) >= state.get("max_iterations", 3):
         # Task complete or max iterations reached
-        client.update_state(AgentState.IDLE)
-        client.update_task(state["task_id"], status="completed", metadata={"critique": critique})
-        client.add_memory(
-            text=f"Critic APPROVED task {state['task_id'][:8]} after {state['iteration']} iteration(s)",
-            mem_type="episodic"
+        await client.finish_task(
+            state["task_id"],
+            status="completed",
+            metadata={"critique": critique, "score": score},
+            next_state=AgentState.IDLE,
+            memory_text=f"Critic APPROVED task {state['task_id'][:8]} after {state['iteration']} iteration(s)"
         )
         return {
-            **state,
             "current_phase": AgentState.IDLE,
             "critique": critique,
             "task_id": None,
@@ -283,14 +598,14 @@ Evaluate this output against the task requirements."""
         }
     else:
         # Send back for revision
-        client.update_state(AgentState.EXECUTING)
-        client.update_task(state["task_id"], status="pending", metadata={"critique": critique})
-        client.add_memory(
-            text=f"Critic REJECTED task {state['task_id'][:8]}: Sending back for revision",
-            mem_type="episodic"
+        await client.finish_task(
+            state["task_id"],
+            status="pending",
+            metadata={"critique": critique, "score": score},
+            next_state=AgentState.EXECUTING,
+            memory_text=f"Critic REJECTED task {state['task_id'][:8]}: Sending back for revision"
         )
         return {
-            **state,
             "current_phase": AgentState.EXECUTING,
             "critique": critique
         }
@@ -366,14 +681,27 @@ def create_hive_graph() -> StateGraph:
     return graph.compile()
 
 
+# Compiled once; the graph is stateless, so every run can share it
+_COMPILED_GRAPH = create_hive_graph()
+
+
 # --- MAIN EXECUTION ---
 def run_hive_loop(max_iterations: int = 3) -> dict:
     """
     Execute one iteration of the Hive Loop.
     Returns the final state after processing.
     """
-    graph = create_hive_graph()
+    async def _run() -> dict:
+        try:
+            return await arun_hive_loop(max_iterations)
+        finally:
+            await close_shared_client()
     
+    return asyncio.run(_run())
+
+
+async def arun_hive_loop(max_iterations: int = 3) -> dict:
+    """Async variant of run_hive_loop for callers already inside an event loop."""
     initial_state: HiveState = {
         "current_phase": AgentState.IDLE,
         "task_id": None,
@@ -387,7 +715,7 @@ def run_hive_loop(max_iterations: int = 3) -> dict:
     }
     
     # Run the graph
-    final_state = graph.invoke(initial_state)
+    final_state = await _COMPILED_GRAPH.ainvoke(initial_state)
     return final_state
 
 
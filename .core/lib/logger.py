@@ -12,7 +12,6 @@ Usage:
 """
 
 import os
-import json
 import sys
 import time
 from datetime import datetime
@@ -20,7 +19,12 @@ from pathlib import Path
 from typing import Any, Optional
 from enum import Enum
 import threading
-from queue import Queue
+from collections import deque
+
+try:
+    from .json_utils import dumps as json_dumps
+except ImportError:
+    from json_utils import dumps as json_dumps
 
 
 class LogLevel(str, Enum):
@@ -40,13 +44,52 @@ LEVEL_PRIORITY = {
     LogLevel.CRITICAL: 4,
 }
 
+# Integer levels used on the hot path (index into LEVEL_NAMES)
+DEBUG, INFO, WARN, ERROR, CRITICAL = range(5)
+LEVEL_NAMES = tuple(level.value for level in LogLevel)
+
+LOG_ATOMIC_WRITE = 4096  # PIPE_BUF: O_APPEND writes up to this size don't interleave across processes
+LOG_WRITER_POLL_INTERVAL = 0.1  # seconds the idle writer waits before rechecking
+LOG_QUEUE_SIZE = 65536  # pending file entries; the oldest are dropped beyond this
+
+CONSOLE_COLORS = {
+    "DEBUG": "\033[90m",    # Gray
+    "INFO": "\033[36m",     # Cyan
+    "WARN": "\033[33m",     # Yellow
+    "ERROR": "\033[31m",    # Red
+    "CRITICAL": "\033[35m", # Magenta
+}
+CONSOLE_RESET = "\033[0m"
+
+# (epoch second, "YYYY-MM-DDTHH:MM:SS") -- the date/time part is formatted
+# at most once per second; rebinding the tuple keeps readers consistent.
+_ts_cache = (-1, "")
+
+
+def _utc_timestamp() -> str:
+    """ISO-8601 UTC timestamp with microseconds, e.g. 2025-01-01T12:00:00.123456Z."""
+    global _ts_cache
+    now = time.time()
+    sec = int(now)
+    cached_sec, prefix = _ts_cache
+    if sec != cached_sec:
+        prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(sec))
+        _ts_cache = (sec, prefix)
+    return f"{prefix}.{int((now - sec) * 1_000_000):06d}Z"
+
 
 class StructuredLogger:
     """JSON-structured logger with async file writing and rotation."""
     
     _instances: dict = {}
     _lock = threading.Lock()
-    _write_queue: Queue = Queue()
+    # Pending (log_dir, service, entry) items: a bounded ring, so a log storm
+    # costs dropped entries (counted in dropped_logs) rather than blocking
+    # callers or growing memory. append/popleft are atomic, and the Event
+    # only wakes the writer when it is idle.
+    _write_queue: deque = deque(maxlen=LOG_QUEUE_SIZE)
+    dropped_logs = 0
+    _write_event = threading.Event()
     _writer_thread: Optional[threading.Thread] = None
     _running = False
     
@@ -68,99 +111,132 @@ class StructuredLogger:
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
         self.min_level = LogLevel(os.getenv("LOG_LEVEL", "INFO").upper())
+        self._min_prio = LEVEL_PRIORITY[self.min_level]
         self.console_enabled = os.getenv("LOG_CONSOLE", "true").lower() == "true"
         self.file_enabled = os.getenv("LOG_FILE", "true").lower() == "true"
         
-        self._current_log_file: Optional[Path] = None
-        self._current_date: Optional[str] = None
-        self._file_handle = None
+        # Console line pieces that only depend on level and service
+        service_padded = self.service_name[:12].ljust(12)
+        self._console_tags = {
+            level.value: f"] [{level.value:8}] [{service_padded}] " for level in LogLevel
+        }
         
         # Start background writer
         self._start_writer()
         self._initialized = True
     
     def _start_writer(self):
-        """Start background log writer thread."""
+        """Start the background log writer thread shared by all loggers."""
         if not StructuredLogger._running:
             StructuredLogger._running = True
             StructuredLogger._writer_thread = threading.Thread(
-                target=self._background_writer,
+                target=StructuredLogger._background_writer,
                 daemon=True
             )
             StructuredLogger._writer_thread.start()
     
-    def _background_writer(self):
-        """Background thread that writes logs to file."""
+    @staticmethod
+    def _background_writer():
+        """
+        Background thread that drains queued logs in batches to file.
+        File descriptors live only here, one per (log file, day).
+        """
+        write_queue = StructuredLogger._write_queue
+        write_event = StructuredLogger._write_event
+        handles: dict = {}
+        reported_drops = 0
         while StructuredLogger._running:
-            try:
-                log_entry = StructuredLogger._write_queue.get(timeout=1.0)
-                if log_entry is None:
-                    continue
-                self._write_to_file(log_entry)
-            except:
-                continue
-    
-    def _get_log_file(self) -> Path:
-        """Get current log file, rotating daily."""
-        today = datetime.now().strftime("%Y-%m-%d")
-        if self._current_date != today:
-            self._current_date = today
-            self._current_log_file = self.log_dir / f"{self.service_name}_{today}.log"
-            if self._file_handle:
-                self._file_handle.close()
-            self._file_handle = None
-        return self._current_log_file
-    
-    def _write_to_file(self, log_entry: dict):
-        """Write log entry to file."""
-        if not self.file_enabled:
-            return
+            write_event.wait(timeout=LOG_WRITER_POLL_INTERVAL)
+            write_event.clear()
+            batches: dict = {}
+            while True:
+                try:
+                    log_dir, service_name, entry = write_queue.popleft()
+                except IndexError:
+                    break
+                batches.setdefault((log_dir, service_name), []).append(entry)
+            
+            if batches:
+                today = datetime.now().strftime("%Y-%m-%d")
+                StructuredLogger._close_stale_handles(handles, today)
+                for (log_dir, service_name), entries in batches.items():
+                    StructuredLogger._write_to_file(handles, log_dir, service_name, today, entries)
             
-        log_file = self._get_log_file()
+            dropped = StructuredLogger.dropped_logs
+            if dropped != reported_drops:
+                print(f"[LOG ERROR] Log queue full, dropped {dropped - reported_drops} entries", file=sys.stderr)
+                reported_drops = dropped
+    
+    @staticmethod
+    def _close_stale_handles(handles: dict, today: str):
+        """Close descriptors from previous days (daily rotation)."""
+        for key in [key for key in handles if key[2] != today]:
+            try:
+                os.close(handles.pop(key))
+            except Exception as e:
+                print(f"[LOG ERROR] Failed to close log file: {e}", file=sys.stderr)
+    
+    @staticmethod
+    def _write_to_file(handles: dict, log_dir: Path, service_name: str, today: str, log_entries: list):
+        """
+        Append a batch of one service's log entries straight to the kernel
+        (unbuffered, so nothing is lost if the process dies). Lines go out in
+        chunks of at most LOG_ATOMIC_WRITE bytes, so other processes
+        appending to the same file never split a line.
+        """
+        key = (log_dir, service_name, today)
         try:
-            if self._file_handle is None:
-                self._file_handle = open(log_file, "a", encoding="utf-8")
-            self._file_handle.write(json.dumps(log_entry) + "\n")
-            self._file_handle.flush()
+            fd = handles.get(key)
+            if fd is None:
+                log_file = log_dir / f"{service_name}_{today}.log"
+                fd = handles[key] = os.open(log_file, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            chunk = []
+            size = 0
+            for entry in log_entries:
+                try:
+                    line = json_dumps(entry) + b"\n"
+                except Exception as e:
+                    # Drop only the unserializable entry, not the rest of the batch
+                    print(f"[LOG ERROR] Failed to serialize log entry: {e}", file=sys.stderr)
+                    continue
+                if chunk and size + len(line) > LOG_ATOMIC_WRITE:
+                    os.write(fd, b"".join(chunk))
+                    chunk, size = [], 0
+                chunk.append(line)
+                size += len(line)
+            if chunk:
+                os.write(fd, b"".join(chunk))
         except Exception as e:
             print(f"[LOG ERROR] Failed to write to file: {e}", file=sys.stderr)
     
-    def _should_log(self, level: LogLevel) -> bool:
+    def _should_log(self, level: int) -> bool:
         """Check if level meets minimum threshold."""
-        return LEVEL_PRIORITY[level] >= LEVEL_PRIORITY[self.min_level]
+        return level >= self._min_prio
     
     def _format_console(self, entry: dict) -> str:
         """Format log entry for console output."""
         level = entry["level"]
-        colors = {
-            "DEBUG": "\033[90m",    # Gray
-            "INFO": "\033[36m",     # Cyan
-            "WARN": "\033[33m",     # Yellow
-            "ERROR": "\033[31m",    # Red
-            "CRITICAL": "\033[35m", # Magenta
-        }
-        reset = "\033[0m"
-        color = colors.get(level, "")
-        
-        timestamp = entry["timestamp"].split("T")[1][:8]
-        service = entry["service"][:12].ljust(12)
-        message = entry["message"]
         
-        # Add extra fields if present
-        extras = {k: v for k, v in entry.items() 
-                  if k not in ["timestamp", "level", "service", "message"]}
-        extra_str = f" {extras}" if extras else ""
+        # Add extra fields if present (entries always carry the 4 base keys)
+        extra_str = ""
+        if len(entry) > 4:
+            extras = {k: v for k, v in entry.items() 
+                      if k not in ("timestamp", "level", "service", "message")}
+            extra_str = f" {extras}"
         
-        return f"{color}[{timestamp}] [{level:8}] [{service}] {message}{extra_str}{reset}"
+        return "".join((
+            CONSOLE_COLORS.get(level, ""), "[", entry["timestamp"][11:19],
+            self._console_tags[level], entry["message"], extra_str, CONSOLE_RESET
+        ))
     
-    def _log(self, level: LogLevel, message: str, **kwargs):
+    def _log(self, level: int, message: str, **kwargs):
         """Core logging method."""
-        if not self._should_log(level):
+        if level < self._min_prio:
             return
             
         entry = {
-            "timestamp": datetime.utcnow().isoformat() + "Z",
-            "level": level.value,
+            "timestamp": _utc_timestamp(),
+            "level": LEVEL_NAMES[level],
             "service": self.service_name,
             "message": message,
             **kwargs
@@ -168,31 +244,36 @@ class StructuredLogger:
         
         # Console output (sync)
         if self.console_enabled:
-            print(self._format_console(entry))
+            sys.stdout.write(self._format_console(entry) + "\n")
         
         # File output (async)
         if self.file_enabled:
-            StructuredLogger._write_queue.put(entry)
+            write_queue = StructuredLogger._write_queue
+            if len(write_queue) == LOG_QUEUE_SIZE:
+                StructuredLogger.dropped_logs += 1
+            write_queue.append((self.log_dir, self.service_name, entry))
+            if not StructuredLogger._write_event.is_set():
+                StructuredLogger._write_event.set()
     
     def debug(self, message: str, **kwargs):
         """Log debug message."""
-        self._log(LogLevel.DEBUG, message, **kwargs)
+        self._log(DEBUG, message, **kwargs)
     
     def info(self, message: str, **kwargs):
         """Log info message."""
-        self._log(LogLevel.INFO, message, **kwargs)
+        self._log(INFO, message, **kwargs)
     
     def warn(self, message: str, **kwargs):
         """Log warning message."""
-        self._log(LogLevel.WARN, message, **kwargs)
+        self._log(WARN, message, **kwargs)
     
     def error(self, message: str, **kwargs):
         """Log error message."""
-        self._log(LogLevel.ERROR, message, **kwargs)
+        self._log(ERROR, message, **kwargs)
     
     def critical(self, message: str, **kwargs):
         """Log critical message."""
-        self._log(LogLevel.CRITICAL, message, **kwargs)
+        self._log(CRITICAL, message, **kwargs)
     
     def task_event(self, event_type: str, task_id: str, **kwargs):
         """Log a task-related event."""
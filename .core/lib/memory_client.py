@@ -28,19 +28,74 @@ except (ImportError, ValueError):
             # Fallback to default if everything fails
             MEMORY_SERVER_URL = "http://127.0.0.1:8000"
 
+try:
+    from .json_utils import post_json
+except ImportError:
+    from json_utils import post_json
+
+# HTTP/2 support is optional (pip install 'httpx[http2]')
+try:
+    import h2  # noqa: F401
+    HAS_HTTP2 = True
+except ImportError:
+    HAS_HTTP2 = False
+
+# --- SHARED TRANSPORT ---
+# Every client in the process shares one connection pool to the server.
+SHARED_POOL_LIMITS = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+# Fail fast on connect/write/pool waits; only reads (long-polls) may take long
+CONNECT_TIMEOUT = 2.0
+WRITE_TIMEOUT = 5.0
+POOL_TIMEOUT = 5.0
+_shared_client: Optional[httpx.AsyncClient] = None
+
+
+def _timeout(read: float) -> httpx.Timeout:
+    return httpx.Timeout(read, connect=CONNECT_TIMEOUT, write=WRITE_TIMEOUT, pool=POOL_TIMEOUT)
+
+
+def get_shared_client() -> httpx.AsyncClient:
+    """Get or create the process-wide AsyncClient."""
+    global _shared_client
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = httpx.AsyncClient(
+            http2=HAS_HTTP2,
+            timeout=_timeout(30.0),
+            limits=SHARED_POOL_LIMITS
+        )
+    return _shared_client
+
+
+async def close_shared_client():
+    """Close the process-wide AsyncClient (call once on shutdown)."""
+    global _shared_client
+    if _shared_client is not None:
+        await _shared_client.aclose()
+        _shared_client = None
+
+
 class AsyncMemoryClient:
     """Async HTTP client for the Memory Server."""
     
-    def __init__(self, base_url: str = MEMORY_SERVER_URL, timeout: float = 30.0):
+    def __init__(
+        self,
+        base_url: str = MEMORY_SERVER_URL,
+        timeout: float = 30.0,
+        client: Optional[httpx.AsyncClient] = None
+    ):
         self.base_url = base_url
-        self.client = httpx.AsyncClient(timeout=timeout)
+        self.timeout = timeout
+        # Uses the process-wide pool unless a dedicated client is passed in;
+        # neither is closed by close() (see close_shared_client)
+        self.client = client or get_shared_client()
         
     async def register(self, agent_id: str, agent_type: str, capabilities: List[str]) -> bool:
         """Register agent capabilities."""
         try:
-            resp = await self.client.post(
+            resp = await post_json(
+                self.client,
                 f"{self.base_url}/agents/register",
-                json={
+                {
                     "agent_id": agent_id,
                     "agent_type": agent_type,
                     "capabilities": capabilities
@@ -54,27 +109,50 @@ class AsyncMemoryClient:
 
     async def heartbeat(self, agent_id: str) -> bool:
         """Send heartbeat."""
+        return await self.heartbeat_status(agent_id) == 200
+
+    async def heartbeat_status(self, agent_id: str) -> Optional[int]:
+        """Send heartbeat; returns the HTTP status, or None if the server is unreachable."""
         try:
             resp = await self.client.post(f"{self.base_url}/agents/heartbeat/{agent_id}")
-            return resp.status_code == 200
-        except:
-            return False
+            return resp.status_code
+        except httpx.HTTPError:
+            return None
+
+    async def get_next_task(self, agent_id: str, wait: int = 0) -> Optional[Dict[str, Any]]:
+        """
+        Poll for next task assigned to agent.
+        With wait > 0 the server holds the request open (long-poll) for up to
+        `wait` seconds until a task is available.
+        """
+        tasks = await self.get_next_tasks(agent_id, 1, wait=wait)
+        return tasks[0] if tasks else None
 
-    async def get_next_task(self, agent_id: str) -> Optional[Dict[str, Any]]:
-        """Poll for next task assigned to agent."""
+    async def get_next_tasks(self, agent_id: str, limit: int = 1, wait: int = 0) -> List[Dict[str, Any]]:
+        """Claim up to `limit` tasks assigned to agent in a single poll."""
+        params = {"max": limit}
+        read_timeout = self.timeout
+        if wait > 0:
+            params["wait"] = wait
+            read_timeout += wait
         try:
-            resp = await self.client.get(f"{self.base_url}/agents/{agent_id}/next")
+            resp = await self.client.get(
+                f"{self.base_url}/agents/{agent_id}/next",
+                params=params,
+                timeout=_timeout(read_timeout)
+            )
             resp.raise_for_status()
-            return resp.json().get("task")
-        except:
-            return None
+            return resp.json().get("tasks", [])
+        except (httpx.HTTPError, ValueError):
+            return []
 
     async def update_task(self, task_id: str, status: str, metadata: Dict[str, Any] = None) -> bool:
         """Update task status."""
         try:
-            await self.client.post(
+            await post_json(
+                self.client,
                 f"{self.base_url}/tasks/update",
-                json={
+                {
                     "task_id": task_id,
                     "status": status,
                     "metadata": metadata or {}
@@ -88,16 +166,17 @@ class AsyncMemoryClient:
     async def add_memory(self, text: str, mem_type: str = "episodic", metadata: Dict[str, Any] = None) -> bool:
         """Add memory entry."""
         try:
-            await self.client.post(
+            await post_json(
+                self.client,
                 f"{self.base_url}/memory/add",
-                json={
+                {
                     "text": text,
                     "type": mem_type,
                     "metadata": metadata or {}
                 }
             )
             return True
-        except:
+        except httpx.HTTPError:
             return False
 
     async def read_file(self, path: str) -> Optional[str]:
@@ -106,19 +185,20 @@ class AsyncMemoryClient:
             resp = await self.client.get(f"{self.base_url}/fs/read", params={"path": path})
             if resp.status_code == 200:
                 return resp.json().get("content")
-        except:
+        except (httpx.HTTPError, ValueError):
             pass
         return None
 
     async def write_file(self, path: str, content: str) -> bool:
         """Write file content via FS API."""
         try:
-            resp = await self.client.post(
+            resp = await post_json(
+                self.client,
                 f"{self.base_url}/fs/write",
-                json={"path": path, "content": content}
+                {"path": path, "content": content}
             )
             return resp.status_code == 200
-        except:
+        except httpx.HTTPError:
             return False
 
     async def list_tasks(self) -> List[Dict[str, Any]]:
@@ -127,10 +207,9 @@ class AsyncMemoryClient:
             resp = await self.client.get(f"{self.base_url}/tasks/list")
             if resp.status_code == 200:
                 return resp.json().get("tasks", [])
-        except:
+        except (httpx.HTTPError, ValueError):
             pass
         return []
 
     async def close(self):
-        """Close the HTTP client."""
-        await self.client.aclose()
+        """Release this client. The shared pool stays open for other clients."""
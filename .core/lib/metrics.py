@@ -16,25 +16,225 @@ Usage:
 """
 
 import os
+import sys
+import math
+import itertools
 import time
 import threading
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional, List
-from datetime import datetime
-from collections import defaultdict
-import json
+from typing import Dict, Any, Iterator, Optional, List, Tuple
+from functools import lru_cache
+from bisect import bisect_left
+from contextlib import nullcontext
+from collections import defaultdict, deque
 
+try:
+    from .json_utils import dumps as json_dumps
+except ImportError:
+    from json_utils import dumps as json_dumps
 
-@dataclass
+# Percentile sketches are optional: crick (C) or tdigest (pure Python).
+# Without either, histograms fall back to fixed bucket counts.
+try:
+    from crick import TDigest
+    HAS_TDIGEST = True
+except ImportError:
+    try:
+        from tdigest import TDigest
+        HAS_TDIGEST = True
+    except ImportError:
+        HAS_TDIGEST = False
+
+# Lock-free integer counters are optional (pip install atomics)
+try:
+    import atomics
+    HAS_ATOMICS = True
+except ImportError:
+    HAS_ATOMICS = False
+
+
+# With the GIL, a single dict store is atomic, so gauge writes need no lock.
+# Free-threaded builds (3.13t+) report False here and keep the lock.
+GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Counters are partitioned by their `agent` tag, then split across shards
+# picked by thread ID, so unrelated update streams rarely share a lock or dict
+COUNTER_SHARDS = os.cpu_count() or 4
+GLOBAL_AGENT = "_global"  # partition for counters without an agent tag
+
+
+class _CounterShard:
+    """One shard of counter totals with its own lock."""
+    __slots__ = ("lock", "counters")
+    
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters: Dict[str, float] = {}
+
+
+class _LockedInt:
+    """Fallback for atomics.atomic(INT) when the atomics package isn't installed."""
+    __slots__ = ("_lock", "_value")
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._value = 0
+    
+    def fetch_add(self, n: int) -> int:
+        with self._lock:
+            old = self._value
+            self._value = old + n
+        return old
+    
+    def load(self) -> int:
+        return self._value
+    
+    def store(self, value: int):
+        self._value = value
+
+
+def _new_atomic_int():
+    if HAS_ATOMICS:
+        return atomics.atomic(width=8, atype=atomics.INT)
+    return _LockedInt()
+
+
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+TIMING_WINDOW = 1000  # recent samples kept per timing metric
+NS_PER_SECOND = 1_000_000_000
+
+
+@dataclass(slots=True)
+class TimingAgg:
+    """
+    Recent samples of one timing metric (integer nanoseconds) plus running
+    aggregates, so recording and summarizing are O(1). count/sum/sum_sq cover
+    the sample window; min/max cover every sample since the last reset.
+    Integer sums stay exact, and stats() converts to seconds.
+    """
+    samples: deque = field(default_factory=lambda: deque(maxlen=TIMING_WINDOW))
+    count: int = 0
+    sum: int = 0
+    sum_sq: int = 0
+    min: float = math.inf
+    max: float = -math.inf
+    
+    def add(self, value: int):
+        samples = self.samples
+        if len(samples) == samples.maxlen:
+            old = samples[0]  # evicted by the append below
+            self.sum -= old
+            self.sum_sq -= old * old
+        else:
+            self.count += 1
+        samples.append(value)
+        self.sum += value
+        self.sum_sq += value * value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def stats(self) -> Dict[str, float]:
+        n = self.count
+        variance_ns = max(0, n * self.sum_sq - self.sum * self.sum) / (n * n)
+        return {
+            "count": n,
+            "min": self.min / NS_PER_SECOND,
+            "max": self.max / NS_PER_SECOND,
+            "avg": self.sum / n / NS_PER_SECOND,
+            "std": math.sqrt(variance_ns) / NS_PER_SECOND,
+            "last": self.samples[-1] / NS_PER_SECOND,
+        }
+
+
+HISTOGRAM_QUANTILES = (0.5, 0.9, 0.99)
+METRIC_KEY_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=METRIC_KEY_CACHE_SIZE)
+def _make_key_cached(name: str, tag_items: Tuple[Tuple[str, Any], ...]) -> str:
+    """
+    Build the storage key for a name and its sorted tag items. Keys are
+    interned, so every dict holding them can match by identity.
+    """
+    tag_str = ",".join(f"{k}={v}" for k, v in tag_items)
+    return sys.intern(f"{name}{{{tag_str}}}")
+
+
+@lru_cache(maxsize=METRIC_KEY_CACHE_SIZE)
+def _prometheus_name(key: str) -> str:
+    """Prometheus-safe metric name for a storage key (tags dropped)."""
+    return key.split("{")[0].replace(".", "_")
+
+
+_LABEL_ESCAPES = str.maketrans({"\\": "\\\\", '"': '\\"', "\n": "\\n"})
+
+
+def _prometheus_prefix(key: str, tags: Dict[str, Any]) -> str:
+    """Render `studio_<name>{tag="val",...} `, the part of a sample line before its value."""
+    name = f"studio_{_prometheus_name(key)}"
+    if not tags:
+        return name + " "
+    labels = ",".join(f'{k}="{str(v).translate(_LABEL_ESCAPES)}"' for k, v in sorted(tags.items()))
+    return f"{name}{{{labels}}} "
+
+
+@dataclass(slots=True)
+class DigestAgg:
+    """A t-digest of one histogram metric plus exact count/sum/min/max."""
+    digest: Any = field(default_factory=lambda: TDigest())
+    count: int = 0
+    sum: float = 0.0
+    min: float = math.inf
+    max: float = -math.inf
+    
+    def add(self, value: float):
+        self.digest.update(value)
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+    
+    def quantile(self, q: float) -> float:
+        if hasattr(self.digest, "quantile"):
+            return float(self.digest.quantile(q))  # crick
+        return float(self.digest.percentile(q * 100))  # tdigest
+    
+    def stats(self) -> Dict[str, float]:
+        stats = {"count": self.count, "sum": self.sum, "min": self.min, "max": self.max}
+        for q in HISTOGRAM_QUANTILES:
+            stats[f"p{round(q * 100)}"] = self.quantile(q)
+        return stats
+
+
+@dataclass(slots=True)
 class MetricPoint:
-    """A single metric data point."""
+    """The latest data point of one metric key (updated in place; timings in ns)."""
     name: str
     value: float
-    timestamp: float
+    timestamp: int  # time.monotonic_ns() of the update
     tags: Dict[str, str] = field(default_factory=dict)
     metric_type: str = "gauge"
 
 
+# (epoch second, "YYYY-MM-DDTHH:MM:SSZ"); rebinding the tuple keeps readers consistent
+_iso_cache = (-1, "")
+
+
+def _utc_iso_second() -> str:
+    """Current UTC time to the second, formatted at most once per second."""
+    global _iso_cache
+    sec = int(time.time())
+    cached_sec, iso = _iso_cache
+    if sec != cached_sec:
+        iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(sec))
+        _iso_cache = (sec, iso)
+    return iso
+
+
 class MetricsCollector:
     """Thread-safe metrics collector with Prometheus-style metrics."""
     
@@ -53,48 +253,144 @@ class MetricsCollector:
             return
             
         self._metrics: Dict[str, MetricPoint] = {}
-        self._counters: Dict[str, float] = defaultdict(float)
+        self._counter_shards: Dict[str, Tuple[_CounterShard, ...]] = {}
+        # Untagged integer counters registered up front, indexed by handle
+        self._fast_handles: Dict[str, int] = {}
+        self._fast_counters: List[Any] = []
         self._gauges: Dict[str, float] = {}
-        self._timings: Dict[str, List[float]] = defaultdict(list)
-        self._histograms: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._timings: Dict[str, TimingAgg] = defaultdict(TimingAgg)
+        # Bucket counts per (name, key, bounds), one slot per bucket
+        self._histograms: Dict[Tuple[str, str, Tuple[float, ...]], List[int]] = {}
+        self._tdigests: Dict[str, DigestAgg] = defaultdict(DigestAgg)
+        
+        # Prometheus rendering: a line prefix per key, and the rendered
+        # counter/gauge lines, reused until the next counter/gauge write
+        self._prom_prefix: Dict[str, str] = {}
+        self._write_seq = itertools.count()
+        self._prom_version = next(self._write_seq)
+        self._prom_body: Optional[Tuple[int, bytes]] = None
         
         self._start_time = time.time()
         self._lock = threading.Lock()
+        self._gauge_lock = nullcontext() if GIL_ENABLED else self._lock
+        
+        # Agent heartbeats: one atomic monotonic_ns timestamp per agent
+        self._last_seen: Dict[str, Any] = {}
+        self._heartbeat_handle = self.register_counter("agent.heartbeats")
         self._initialized = True
     
     # --- Counter Methods ---
     
     def increment(self, name: str, value: float = 1.0, **tags):
         """Increment a counter metric."""
+        key = self._make_key(name, tags)
+        self._update_metric(key, name, value, "counter", tags)
+        agent = tags.get("agent", GLOBAL_AGENT)
+        shards = self._counter_shards.get(agent) or self._new_partition(agent)
+        shard = shards[threading.get_ident() % COUNTER_SHARDS]
+        with shard.lock:
+            shard.counters[key] = shard.counters.get(key, 0.0) + value
+        self._prom_version = next(self._write_seq)
+    
+    def _new_partition(self, agent: str) -> Tuple[_CounterShard, ...]:
+        """Create (once) the counter shards for one agent."""
         with self._lock:
-            key = self._make_key(name, tags)
-            self._counters[key] += value
-            self._update_metric(name, self._counters[key], "counter", tags)
+            shards = self._counter_shards.get(agent)
+            if shards is None:
+                shards = self._counter_shards[agent] = tuple(_CounterShard() for _ in range(COUNTER_SHARDS))
+            return shards
+    
+    def _all_counter_shards(self) -> List[_CounterShard]:
+        """Every counter shard across all agent partitions."""
+        return [shard for shards in list(self._counter_shards.values()) for shard in shards]
+    
+    def register_counter(self, name: str) -> int:
+        """
+        Pre-register an untagged integer counter for increment_fast() and
+        return its handle. Registering the same name again returns the same handle.
+        """
+        with self._lock:
+            handle = self._fast_handles.get(name)
+            if handle is None:
+                self._prom_prefix.setdefault(name, _prometheus_prefix(name, {}))
+                self._fast_counters.append(_new_atomic_int())
+                handle = self._fast_handles[name] = len(self._fast_counters) - 1
+            return handle
+    
+    def increment_fast(self, handle: int, n: int = 1):
+        """Increment a registered counter: one atomic add, no lock or key building."""
+        self._fast_counters[handle].fetch_add(n)
+        self._prom_version = next(self._write_seq)
+    
+    # --- Agent Heartbeats ---
+    
+    def register_agent(self, agent_id: str):
+        """Allocate (once) the last-seen slot for an agent."""
+        with self._lock:
+            seen = self._last_seen.get(agent_id)
+            if seen is None:
+                seen = self._last_seen[agent_id] = _new_atomic_int()
+            return seen
+    
+    def record_heartbeat(self, agent_id: str):
+        """Mark an agent as seen now: one atomic store plus one atomic add."""
+        seen = self._last_seen.get(agent_id) or self.register_agent(agent_id)
+        seen.store(time.monotonic_ns())
+        self.increment_fast(self._heartbeat_handle)
+    
+    def agents_last_seen(self) -> Dict[str, float]:
+        """Seconds since each in-process agent's last heartbeat."""
+        now = time.monotonic_ns()
+        return {
+            agent_id: (now - seen.load()) / NS_PER_SECOND
+            for agent_id, seen in list(self._last_seen.items())
+        }
     
     def decrement(self, name: str, value: float = 1.0, **tags):
         """Decrement a counter metric."""
         self.increment(name, -value, **tags)
     
+    def _counter_value(self, key: str) -> float:
+        """Current total of one counter across all shards (and its registered counter, if any)."""
+        total = sum(shard.counters.get(key, 0.0) for shard in self._all_counter_shards())
+        handle = self._fast_handles.get(key)
+        if handle is not None:
+            total += self._fast_counters[handle].load()
+        return total
+    
+    def _counter_totals(self) -> Dict[str, float]:
+        """Totals of every counter, summed across shards."""
+        totals: Dict[str, float] = defaultdict(float)
+        for shard in self._all_counter_shards():
+            with shard.lock:
+                for key, value in shard.counters.items():
+                    totals[key] += value
+        for name, handle in self._fast_handles.items():
+            totals[name] += self._fast_counters[handle].load()
+        return dict(totals)
+    
     # --- Gauge Methods ---
     
     def gauge(self, name: str, value: float, **tags):
         """Set a gauge metric (point-in-time value)."""
-        with self._lock:
-            key = self._make_key(name, tags)
+        key = self._make_key(name, tags)
+        self._update_metric(key, name, value, "gauge", tags)
+        with self._gauge_lock:
             self._gauges[key] = value
-            self._update_metric(name, value, "gauge", tags)
+        self._prom_version = next(self._write_seq)
     
     # --- Timing Methods ---
     
     def timing(self, name: str, duration: float, **tags):
-        """Record a timing metric."""
+        """Record a timing metric in seconds."""
+        self.timing_ns(name, int(duration * NS_PER_SECOND), **tags)
+    
+    def timing_ns(self, name: str, duration_ns: int, **tags):
+        """Record a timing metric in integer nanoseconds (no float conversion)."""
         with self._lock:
             key = self._make_key(name, tags)
-            self._timings[key].append(duration)
-            # Keep only last 1000 timings
-            if len(self._timings[key]) > 1000:
-                self._timings[key] = self._timings[key][-1000:]
-            self._update_metric(name, duration, "timing", tags)
+            self._timings[key].add(duration_ns)
+            self._update_metric(key, name, duration_ns, "timing", tags)
     
     def time(self, name: str, **tags):
         """Context manager for timing blocks."""
@@ -103,98 +399,152 @@ class MetricsCollector:
     # --- Histogram Methods ---
     
     def histogram(self, name: str, value: float, buckets: List[float] = None, **tags):
-        """Record a histogram metric."""
-        if buckets is None:
-            buckets = [0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0]
+        """
+        Record a histogram metric. With a t-digest library installed this
+        feeds a percentile sketch (and `buckets` is ignored).
+        """
+        if HAS_TDIGEST:
+            key = self._make_key(name, tags)
+            with self._lock:
+                self._tdigests[key].add(value)
+            self._update_metric(key, name, value, "histogram", tags)
+            return
         
+        bounds = DEFAULT_BUCKETS if buckets is None else tuple(buckets)
+        # First bucket whose upper bound is >= value (values above every bound aren't counted)
+        index = bisect_left(bounds, value)
+        key = self._make_key(name, tags)
         with self._lock:
-            key = self._make_key(name, tags)
-            for bucket in buckets:
-                if value <= bucket:
-                    bucket_key = f"{key}_le_{bucket}"
-                    self._histograms[name][bucket_key] += 1
-                    break
-            self._update_metric(name, value, "histogram", tags)
+            if index < len(bounds):
+                counts = self._histograms.get((name, key, bounds))
+                if counts is None:
+                    counts = self._histograms[(name, key, bounds)] = [0] * len(bounds)
+                counts[index] += 1
+            self._update_metric(key, name, value, "histogram", tags)
+    
+    def _bucket_snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Bucket counts as {name: {"<key>_le_<bound>": count}}."""
+        histograms: Dict[str, Dict[str, int]] = defaultdict(dict)
+        for (name, key, bounds), counts in self._histograms.items():
+            for bound, count in zip(bounds, counts):
+                if count:
+                    histograms[name][f"{key}_le_{bound}"] = count
+        return dict(histograms)
     
     # --- Utility Methods ---
     
     def _make_key(self, name: str, tags: Dict[str, str]) -> str:
         """Create a unique key from name and tags."""
         if not tags:
-            return name
-        tag_str = ",".join(f"{k}={v}" for k, v in sorted(tags.items()))
-        return f"{name}{{{tag_str}}}"
+            return sys.intern(name)
+        if len(tags) == 1:
+            # The common case: a single tag needs no sorting
+            return _make_key_cached(name, tuple(tags.items()))
+        return _make_key_cached(name, tuple(sorted(tags.items())))
     
-    def _update_metric(self, name: str, value: float, metric_type: str, tags: Dict[str, str]):
-        """Update internal metrics storage."""
-        key = self._make_key(name, tags)
+    def _update_metric(self, key: str, name: str, value: float, metric_type: str, tags: Dict[str, str]):
+        """Record the latest update to a metric (for counters, the increment)."""
+        point = self._metrics.get(key)
+        if point is not None:
+            # Name, tags and type are fixed by the key; only value and time change
+            point.value = value
+            point.timestamp = time.monotonic_ns()
+            return
+        if key not in self._prom_prefix:
+            self._prom_prefix[key] = _prometheus_prefix(key, tags)
         self._metrics[key] = MetricPoint(
             name=name,
             value=value,
-            timestamp=time.time(),
+            timestamp=time.monotonic_ns(),
             tags=tags,
             metric_type=metric_type
         )
     
-    def snapshot(self) -> Dict[str, Any]:
-        """Get current snapshot of all metrics."""
+    def snapshot(
+        self,
+        *,
+        include_timestamp: bool = True,
+        include_timings: bool = True,
+        include_histograms: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Get current snapshot of all metrics. Callers that only need counters
+        and gauges can switch off the sections they'd discard.
+        """
         with self._lock:
-            uptime = time.time() - self._start_time
-            
-            # Calculate timing stats
-            timing_stats = {}
-            for key, values in self._timings.items():
-                if values:
-                    timing_stats[key] = {
-                        "count": len(values),
-                        "min": min(values),
-                        "max": max(values),
-                        "avg": sum(values) / len(values),
-                        "last": values[-1],
-                    }
-            
-            return {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "uptime_seconds": uptime,
-                "counters": dict(self._counters),
-                "gauges": dict(self._gauges),
-                "timing_stats": timing_stats,
-                "histograms": {k: dict(v) for k, v in self._histograms.items()},
-            }
+            snap: Dict[str, Any] = {}
+            if include_timestamp:
+                snap["timestamp"] = _utc_iso_second()
+            snap["uptime_seconds"] = time.time() - self._start_time
+            snap["counters"] = self._counter_totals()
+            snap["gauges"] = dict(self._gauges)
+            if include_timings:
+                snap["timing_stats"] = {key: agg.stats() for key, agg in self._timings.items() if agg.count}
+            if include_histograms:
+                snap["histograms"] = self._bucket_snapshot()
+                snap["histogram_stats"] = {key: agg.stats() for key, agg in self._tdigests.items()}
+            if self._last_seen:
+                snap["agent_last_seen_seconds"] = self.agents_last_seen()
+            return snap
     
-    def prometheus_format(self) -> str:
-        """Export metrics in Prometheus exposition format."""
-        lines = []
-        
-        # Add uptime
+    def snapshot_light(self, *, include_timestamp: bool = False, include_timings: bool = False) -> Dict[str, Any]:
+        """Counters and gauges (plus uptime) without the costlier sections."""
+        return self.snapshot(
+            include_timestamp=include_timestamp,
+            include_timings=include_timings,
+            include_histograms=False
+        )
+    
+    def prometheus_iter(self) -> Iterator[bytes]:
+        """
+        Yield the Prometheus exposition one encoded line at a time, so a
+        server can stream it without building the whole payload first.
+        """
         uptime = time.time() - self._start_time
-        lines.append(f"# HELP studio_uptime_seconds System uptime in seconds")
-        lines.append(f"# TYPE studio_uptime_seconds gauge")
-        lines.append(f"studio_uptime_seconds {uptime:.2f}")
-        
-        # Add counters
-        for key, value in self._counters.items():
-            name = key.split("{")[0].replace(".", "_")
-            lines.append(f"studio_{name} {value}")
+        yield b"# HELP studio_uptime_seconds System uptime in seconds\n"
+        yield b"# TYPE studio_uptime_seconds gauge\n"
+        yield f"studio_uptime_seconds {uptime:.2f}\n".encode()
         
-        # Add gauges
-        for key, value in self._gauges.items():
-            name = key.split("{")[0].replace(".", "_")
-            lines.append(f"studio_{name} {value}")
+        # Counter and gauge lines are only re-rendered after a write
+        version = self._prom_version
+        cached = self._prom_body
+        if cached is not None and cached[0] == version:
+            yield cached[1]
+            return
         
-        return "\n".join(lines)
+        with self._gauge_lock:
+            gauges = list(self._gauges.items())  # One C call: atomic under the GIL
+        prefix = self._prom_prefix
+        lines = []
+        for items in (self._counter_totals().items(), gauges):
+            for key, value in items:
+                line = f"{prefix[key]}{value}\n".encode()
+                lines.append(line)
+                yield line
+        self._prom_body = (version, b"".join(lines))
     
-    def json_format(self) -> str:
-        """Export metrics as JSON."""
-        return json.dumps(self.snapshot(), indent=2)
+    def prometheus_format(self) -> str:
+        """Export metrics in Prometheus exposition format."""
+        return b"".join(self.prometheus_iter()).decode()
+    
+    def json_format(self, pretty: bool = False) -> str:
+        """Export metrics as JSON (compact unless `pretty`)."""
+        return json_dumps(self.snapshot(), indent=pretty).decode("utf-8")
     
     def reset(self):
         """Reset all metrics (for testing)."""
         with self._lock:
-            self._counters.clear()
+            for shard in self._all_counter_shards():
+                with shard.lock:
+                    shard.counters.clear()
+            for counter in self._fast_counters:
+                counter.store(0)
+            self._last_seen.clear()
             self._gauges.clear()
             self._timings.clear()
             self._histograms.clear()
+            self._tdigests.clear()
+            self._prom_version = next(self._write_seq)
             self._metrics.clear()
 
 
@@ -205,15 +555,15 @@ class TimingContext:
         self.collector = collector
         self.name = name
         self.tags = tags
-        self.start_time = None
+        self._start_ns = 0
     
     def __enter__(self):
-        self.start_time = time.time()
+        self._start_ns = time.perf_counter_ns()
         return self
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        duration = time.time() - self.start_time
-        self.collector.timing(self.name, duration, **self.tags)
+        duration_ns = time.perf_counter_ns() - self._start_ns
+        self.collector.timing_ns(self.name, duration_ns, **self.tags)
         return False
 
 
@@ -228,8 +578,8 @@ def task_started(task_id: str, agent: str = "unknown"):
     """Record a task started event."""
     metrics = get_metrics()
     metrics.increment("tasks.started", agent=agent)
-    metrics.gauge("tasks.active", metrics._counters.get("tasks.started", 0) - 
-                  metrics._counters.get("tasks.completed", 0))
+    metrics.gauge("tasks.active", metrics._counter_value("tasks.started") - 
+                  metrics._counter_value("tasks.completed"))
 
 
 def task_completed(task_id: str, duration: float, agent: str = "unknown"):
@@ -248,9 +598,7 @@ def task_failed(task_id: str, error: str, agent: str = "unknown"):
 
 def agent_heartbeat(agent_id: str):
     """Record an agent heartbeat."""
-    metrics = get_metrics()
-    metrics.gauge(f"agent.last_seen.{agent_id}", time.time())
-    metrics.increment("agent.heartbeats", agent_id=agent_id)
+    get_metrics().record_heartbeat(agent_id)
 
 
 if __name__ == "__main__":
@@ -269,7 +617,7 @@ if __name__ == "__main__":
         time.sleep(0.05)
     
     print("=== Metrics Snapshot ===")
-    print(metrics.json_format())
+    print(metrics.json_format(pretty=True))
     
     print("\n=== Prometheus Format ===")
     print(metrics.prometheus_format())
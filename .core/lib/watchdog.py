@@ -14,8 +14,10 @@ import os
 import time
 import threading
 import httpx
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Deque, Dict, Optional, List
 from dataclasses import dataclass
 from enum import Enum
 
@@ -27,6 +29,14 @@ except ImportError:
     import logging
     logger = logging.getLogger("watchdog")
 
+try:
+    from .json_utils import parse_metadata, post_json
+except ImportError:
+    from json_utils import parse_metadata, post_json
+
+
+MAX_ALERTS = 100  # most recent alerts kept in memory
+
 
 class ServiceStatus(str, Enum):
     ONLINE = "online"
@@ -60,13 +70,22 @@ class Watchdog:
         self.heartbeat_timeout = heartbeat_timeout
         
         self.services: Dict[str, ServiceHealth] = {}
-        self.alerts: List[Dict] = []
+        self.alerts: Deque[Dict] = deque(maxlen=MAX_ALERTS)
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        # One keep-alive pool for every check, instead of a connection per call
+        self._client = self._new_client()
         
         # Configure services to monitor
         self._configure_services()
     
+    @staticmethod
+    def _new_client() -> httpx.Client:
+        return httpx.Client(
+            timeout=5.0,
+            limits=httpx.Limits(max_keepalive_connections=16, max_connections=32)
+        )
+    
     def _configure_services(self):
         """Configure services to monitor."""
         services = [
@@ -88,19 +107,18 @@ class Watchdog:
         """Check a single service's health."""
         try:
             start = time.time()
-            with httpx.Client(timeout=5.0) as client:
-                resp = client.get(service.url)
-                response_time = (time.time() - start) * 1000
-                
-                if resp.status_code == 200:
-                    service.status = ServiceStatus.ONLINE
-                    service.response_time_ms = response_time
-                    service.error = None
-                    service.consecutive_failures = 0
-                else:
-                    service.status = ServiceStatus.DEGRADED
-                    service.error = f"HTTP {resp.status_code}"
-                    service.consecutive_failures += 1
+            resp = self._client.get(service.url)
+            response_time = (time.time() - start) * 1000
+            
+            if resp.status_code == 200:
+                service.status = ServiceStatus.ONLINE
+                service.response_time_ms = response_time
+                service.error = None
+                service.consecutive_failures = 0
+            else:
+                service.status = ServiceStatus.DEGRADED
+                service.error = f"HTTP {resp.status_code}"
+                service.consecutive_failures += 1
                     
         except httpx.TimeoutException:
             service.status = ServiceStatus.OFFLINE
@@ -119,10 +137,11 @@ class Watchdog:
         return service
     
     def check_all_services(self) -> Dict[str, ServiceHealth]:
-        """Check all configured services."""
+        """Check all configured services concurrently (a cycle takes as long as the slowest probe)."""
+        with ThreadPoolExecutor(max_workers=len(self.services) or 1) as pool:
+            list(pool.map(self.check_service, self.services.values()))
+        
         for name, service in self.services.items():
-            self.check_service(service)
-            
             # Alert on consecutive failures
             if service.consecutive_failures >= 3:
                 self._alert(
@@ -138,76 +157,91 @@ class Watchdog:
         stale_agents = []
         
         try:
-            with httpx.Client(timeout=5.0) as client:
-                resp = client.get(f"{self.memory_server_url}/agents/list")
-                if resp.status_code == 200:
-                    data = resp.json()
-                    agents = data.get("agents", [])
-                    
-                    now = time.time()
-                    for agent in agents:
-                        last_heartbeat = agent.get("last_heartbeat", 0)
-                        if now - last_heartbeat > self.heartbeat_timeout:
-                            stale_agents.append({
-                                "agent_id": agent.get("agent_id"),
-                                "last_seen": last_heartbeat,
-                                "stale_seconds": now - last_heartbeat,
-                            })
-                            
-                            self._alert(
-                                level="warn",
-                                service=f"agent:{agent.get('agent_id')}",
-                                message=f"Agent {agent.get('agent_id')} heartbeat stale for {int(now - last_heartbeat)}s",
-                            )
+            resp = self._client.get(f"{self.memory_server_url}/agents/list")
+            if resp.status_code == 200:
+                data = resp.json()
+                agents = data.get("agents", [])
+                
+                now = time.time()
+                for agent in agents:
+                    last_heartbeat = agent.get("last_heartbeat", 0)
+                    if now - last_heartbeat > self.heartbeat_timeout:
+                        self._report_stale(stale_agents, agent.get("agent_id"), last_heartbeat, now - last_heartbeat)
         except Exception as e:
             logger.error(f"Failed to check agent heartbeats: {e}")
         
         return stale_agents
     
+    def _report_stale(self, stale_agents: List[Dict], agent_id: str, last_seen: float, stale_seconds: float):
+        """Record and alert on an agent whose heartbeat is overdue."""
+        stale_agents.append({
+            "agent_id": agent_id,
+            "last_seen": last_seen,
+            "stale_seconds": stale_seconds,
+        })
+        
+        self._alert(
+            level="warn",
+            service=f"agent:{agent_id}",
+            message=f"Agent {agent_id} heartbeat stale for {int(stale_seconds)}s",
+        )
+    
     def retry_failed_tasks(self, max_retries: int = 3) -> List[Dict]:
         """Retry failed tasks that haven't exceeded max retries."""
         retried_tasks = []
         
         try:
-            with httpx.Client(timeout=10.0) as client:
-                # Get failed tasks
-                resp = client.get(f"{self.memory_server_url}/tasks/list?status=failed")
-                if resp.status_code != 200:
-                    return retried_tasks
-                
-                data = resp.json()
-                tasks = data.get("tasks", [])
+            client = self._client
+            # Get failed tasks
+            resp = client.get(f"{self.memory_server_url}/tasks/list?status=failed", timeout=10.0)
+            if resp.status_code != 200:
+                return retried_tasks
+            
+            data = resp.json()
+            tasks = data.get("tasks", [])
+            
+            updates = []
+            now = time.time()
+            for task in tasks:
+                metadata = parse_metadata(task.get("metadata"))
+                retry_count = metadata.get("retry_count", 0)
                 
-                for task in tasks:
-                    metadata = task.get("metadata", {})
-                    if isinstance(metadata, str):
-                        import json
-                        metadata = json.loads(metadata)
-                    
-                    retry_count = metadata.get("retry_count", 0)
-                    
-                    if retry_count < max_retries:
-                        # Retry the task
-                        retry_resp = client.post(
-                            f"{self.memory_server_url}/tasks/update",
-                            json={
-                                "task_id": task["id"],
-                                "status": "pending",
-                                "metadata": {
-                                    **metadata,
-                                    "retry_count": retry_count + 1,
-                                    "last_retry": time.time(),
-                                }
-                            }
-                        )
-                        
-                        if retry_resp.status_code == 200:
-                            retried_tasks.append({
-                                "task_id": task["id"],
-                                "retry_count": retry_count + 1,
-                            })
-                            logger.info(f"Retried task {task['id'][:8]} (attempt {retry_count + 1})")
-                        
+                if retry_count < max_retries:
+                    updates.append({
+                        "task_id": task["id"],
+                        "status": "pending",
+                        "metadata": {
+                            **metadata,
+                            "retry_count": retry_count + 1,
+                            "last_retry": now,
+                        }
+                    })
+            
+            if not updates:
+                return retried_tasks
+            
+            # Requeue every eligible task in one request
+            retry_resp = post_json(
+                client,
+                f"{self.memory_server_url}/tasks/bulk_update",
+                {"updates": updates},
+                timeout=10.0
+            )
+            if retry_resp.status_code != 200:
+                logger.error(f"Bulk task retry failed: HTTP {retry_resp.status_code}")
+                return retried_tasks
+            
+            missing = set(retry_resp.json().get("missing", []))
+            for update in updates:
+                if update["task_id"] in missing:
+                    continue
+                retry_count = update["metadata"]["retry_count"]
+                retried_tasks.append({
+                    "task_id": update["task_id"],
+                    "retry_count": retry_count,
+                })
+                logger.info(f"Retried task {update['task_id'][:8]} (attempt {retry_count})")
+        
         except Exception as e:
             logger.error(f"Failed to retry tasks: {e}")
         
@@ -221,11 +255,7 @@ class Watchdog:
             "service": service,
             "message": message,
         }
-        self.alerts.append(alert)
-        
-        # Keep only last 100 alerts
-        if len(self.alerts) > 100:
-            self.alerts = self.alerts[-100:]
+        self.alerts.append(alert)  # The deque drops the oldest past MAX_ALERTS
         
         # Log the alert
         log_method = getattr(logger, level, logger.info)
@@ -250,7 +280,7 @@ class Watchdog:
                 }
                 for name, s in self.services.items()
             },
-            "recent_alerts": self.alerts[-10:],
+            "recent_alerts": list(self.alerts)[-10:],
         }
     
     def _run_loop(self):
@@ -271,6 +301,8 @@ class Watchdog:
             return
         
         self._running = True
+        if self._client.is_closed:
+            self._client = self._new_client()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         logger.info("Watchdog started", interval=self.check_interval)
@@ -280,6 +312,7 @@ class Watchdog:
         self._running = False
         if self._thread:
             self._thread.join(timeout=5)
+        self._client.close()
         logger.info("Watchdog stopped")
 
 
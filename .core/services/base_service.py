@@ -27,14 +27,24 @@ except ImportError:
             # Fallback if run from different context
             from .core.lib.memory_client import AsyncMemoryClient
 
+try:
+    from config import LONG_POLL_TIMEOUT
+except ImportError:
+    LONG_POLL_TIMEOUT = 30
+
+POLL_RETRY_DELAY = 5  # seconds to back off when the server is unreachable
+# Polls double as heartbeats; an explicit heartbeat is only sent when no poll
+# has gone out for this long (e.g. every slot is busy with a long task)
+HEARTBEAT_INTERVAL = 30
+
 class BaseAgentService(ABC):
     """
     Abstract base class for autonomous agent services in Studio Mode.
     
     Provides standardized lifecycle management for agents including:
     - Automatic registration with Memory Server
-    - Background heartbeat to maintain online status
-    - Task polling loop to fetch and process assigned work
+    - Task polling loop to fetch and process assigned work (each poll also
+      counts as a heartbeat; a fallback heartbeat covers long busy periods)
     
     Subclasses must implement the `process_task()` method.
     
@@ -48,7 +58,14 @@ class BaseAgentService(ABC):
         asyncio.run(agent.start())
     """
     
-    def __init__(self, agent_id: str, agent_type: str, capabilities: List[str] = [], memory_url: str = None):
+    def __init__(
+        self,
+        agent_id: str,
+        agent_type: str,
+        capabilities: List[str] = [],
+        memory_url: str = None,
+        max_concurrent_tasks: int = 1
+    ):
         """
         Initialize the agent service.
         
@@ -57,6 +74,7 @@ class BaseAgentService(ABC):
             agent_type: Category of agent (e.g., "engineer", "critic", "scout")
             capabilities: List of task types this agent can handle (e.g., ["code", "review"])
             memory_url: Optional custom Memory Server URL. Defaults to http://127.0.0.1:8000
+            max_concurrent_tasks: How many tasks may be processed at once
         """
         self.agent_id = agent_id
         self.agent_type = agent_type
@@ -64,6 +82,11 @@ class BaseAgentService(ABC):
         self.client = AsyncMemoryClient(base_url=memory_url) if memory_url else AsyncMemoryClient()
         self.running = False
         self._task_queue = asyncio.Queue()
+        # Only poll (and so claim) while a processing slot is free
+        self._task_slots = asyncio.Semaphore(max_concurrent_tasks)
+        self._active_tasks: set = set()  # Strong refs to in-flight process_task calls
+        self._last_contact = 0.0  # monotonic time of the last poll or heartbeat
+        self._loops: List[asyncio.Task] = []  # poll + heartbeat loops, cancelled by stop()
 
     async def start(self):
         """Start the service loops."""
@@ -73,44 +96,74 @@ class BaseAgentService(ABC):
         # 1. Register
         await self.client.register(self.agent_id, self.agent_type, self.capabilities)
         
-        # 2. Start Heartbeat Loop
-        asyncio.create_task(self._heartbeat_loop())
-        
-        # 3. Start Task Polling Loop
-        asyncio.create_task(self._poll_loop())
+        self._last_contact = time.monotonic()
         
-        # 4. Keep alive or serve specific logic (can be overridden or awaited)
-        while self.running:
-            await asyncio.sleep(1.0)
+        # 2. Run the task polling loop and the fallback heartbeat until stopped
+        async with asyncio.TaskGroup() as loops:
+            self._loops = [
+                loops.create_task(self._poll_loop()),
+                loops.create_task(self._heartbeat_loop())
+            ]
 
     async def stop(self):
         """Stop the service."""
         print(f"[*] Stopping {self.agent_id}...")
         self.running = False
+        # Don't wait out a held long-poll or heartbeat sleep
+        for loop in self._loops:
+            loop.cancel()
         await self.client.close()
 
     async def _heartbeat_loop(self):
-        """Send heartbeat every 30 seconds."""
+        """Send a heartbeat only when no poll has reached the server recently."""
         while self.running:
-            try:
-                await self.client.heartbeat(self.agent_id)
-            except Exception as e:
-                print(f"[!] Heartbeat failed: {e}")
-            await asyncio.sleep(30)
+            idle = time.monotonic() - self._last_contact
+            if idle >= HEARTBEAT_INTERVAL:
+                try:
+                    await self.client.heartbeat(self.agent_id)
+                except Exception as e:
+                    print(f"[!] Heartbeat failed: {e}")
+                self._last_contact = time.monotonic()
+                idle = 0
+            await asyncio.sleep(HEARTBEAT_INTERVAL - idle)
 
     async def _poll_loop(self):
-        """Poll for next task."""
+        """
+        Long-poll for the next task. The server holds each request until a
+        task is assigned (or LONG_POLL_TIMEOUT passes), so idle agents don't
+        spin. Tasks run in the background so the next poll starts as soon
+        as a processing slot frees up.
+        """
         while self.running:
+            await self._task_slots.acquire()
+            polled_at = self._last_contact = time.monotonic()
             try:
-                task = await self.client.get_next_task(self.agent_id)
-                if task:
-                    print(f"[{self.agent_id}] Processing task: {task['id']}")
-                    await self.process_task(task)
-                else:
-                    await asyncio.sleep(5) # Idle poll interval
+                task = await self.client.get_next_task(self.agent_id, wait=LONG_POLL_TIMEOUT)
+                self._last_contact = time.monotonic()
             except Exception as e:
+                self._task_slots.release()
                 print(f"[!] Poll error: {e}")
-                await asyncio.sleep(5)
+                await asyncio.sleep(POLL_RETRY_DELAY)
+                continue
+            if not task:
+                self._task_slots.release()
+                # An empty reply long before the wait is up means the poll failed
+                if time.monotonic() - polled_at < LONG_POLL_TIMEOUT / 2:
+                    await asyncio.sleep(POLL_RETRY_DELAY)
+                continue
+            print(f"[{self.agent_id}] Processing task: {task['id']}")
+            running = asyncio.create_task(self._run_task(task))
+            self._active_tasks.add(running)
+            running.add_done_callback(self._active_tasks.discard)
+
+    async def _run_task(self, task: Dict[str, Any]):
+        """Process one task and free its slot."""
+        try:
+            await self.process_task(task)
+        except Exception as e:
+            print(f"[!] Task {task.get('id')} failed: {e}")
+        finally:
+            self._task_slots.release()
 
     @abstractmethod
     async def process_task(self, task: Dict[str, Any]):
@@ -1,8 +1,12 @@
 import os
 import sys
-import subprocess
+import asyncio
+import copy
+import time
+import hashlib
 import shutil
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 
 # Add the project root, .core, and current directory to sys.path
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,6 +28,35 @@ except ImportError:
         except (ImportError, ValueError):
             from .core.services.base_service import BaseAgentService
 
+try:
+    from config import CRITIC_MAX_CONCURRENCY
+except ImportError:
+    CRITIC_MAX_CONCURRENCY = 4
+
+# Reviews of unchanged code are reused instead of re-running flake8/pytest
+REVIEW_CACHE_SIZE = 1024
+REVIEW_CACHE_TTL = 600  # seconds
+
+
+def _tree_digest(full_path: str) -> str:
+    """Fingerprint a file or directory by the path, size and mtime of every file in it."""
+    h = hashlib.blake2b(full_path.encode(), digest_size=16)
+    if os.path.isfile(full_path):
+        paths = [full_path]
+    else:
+        paths = []
+        for root, dirs, files in os.walk(full_path):
+            # Skip tool output (.pytest_cache, __pycache__) that reviews themselves write
+            dirs[:] = sorted(d for d in dirs if not d.startswith(".") and d != "__pycache__")
+            paths.extend(os.path.join(root, f) for f in sorted(files))
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        h.update(f"\0{path}\0{st.st_size}\0{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
 class CriticService(BaseAgentService):
     """
     Critic Service: runs static analysis and calculates RepoReason metrics.
@@ -31,8 +64,16 @@ class CriticService(BaseAgentService):
     """
     
     def __init__(self, work_dir: str = "./workspace"):
-        super().__init__(agent_id="critic-1", agent_type="critic", capabilities=["code-review", "linting", "testing"])
+        super().__init__(
+            agent_id="critic-1",
+            agent_type="critic",
+            capabilities=["code-review", "linting", "testing"],
+            max_concurrent_tasks=CRITIC_MAX_CONCURRENCY
+        )
         self.work_dir = os.path.abspath(work_dir)
+        # Bounds polled and batched reviews together
+        self._review_slots = asyncio.Semaphore(CRITIC_MAX_CONCURRENCY)
+        self._review_cache: "OrderedDict[str, tuple]" = OrderedDict()  # digest -> (expires_at, results)
         
     async def process_task(self, task: Dict[str, Any]):
         """Process assigned review task."""
@@ -43,7 +84,7 @@ class CriticService(BaseAgentService):
         
         # 2. Perform Review
         try:
-            results = self._perform_review(task)
+            results = await self._perform_review(task)
             status = "completed" if results["status"] == "pass" else "failed" # or 'needs_revision'
             
             # 3. Update Status
@@ -51,8 +92,23 @@ class CriticService(BaseAgentService):
         except Exception as e:
             await self.update_task(task['id'], "failed", {"error": str(e)})
 
-    def _perform_review(self, task: Dict[str, Any]) -> Dict[str, Any]:
-        """Internal synchronous review logic."""
+    async def review_batch(self, tasks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Review several tasks concurrently (at most CRITIC_MAX_CONCURRENCY at once).
+        Results keep the input order; a review that raised comes back as a failed result.
+        """
+        results = await asyncio.gather(*(self._perform_review(t) for t in tasks), return_exceptions=True)
+        return [
+            {"lint_score": 0, "errors": [str(r)], "status": "failed"} if isinstance(r, Exception) else r
+            for r in results
+        ]
+
+    async def _perform_review(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        async with self._review_slots:
+            return await self._review(task)
+
+    async def _review(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        """Internal review logic; lint and tests run as concurrent subprocesses."""
         # Determine target path
         metadata = task.get("metadata", {})
         if isinstance(metadata, str):
@@ -75,37 +131,70 @@ class CriticService(BaseAgentService):
             results["errors"].append(f"Path not found: {full_path}")
             results["status"] = "failed"
             return results
+        
+        key = await asyncio.to_thread(_tree_digest, full_path)
+        cached = self._cached_review(key)
+        if cached is not None:
+            print(f"[Critic] {full_path} unchanged since last review, reusing results")
+            return cached
             
-        # 1. Run Linter (Flake8)
-        print(f"[Critic] Running linter on {full_path}...")
-        try:
-            # Check if flake8 is installed, if not, skip or use a fallback
-            lint_cmd = ["flake8", full_path, "--count", "--select=E9,F63,F7,F82", "--show-source", "--statistics"]
-            process = subprocess.run(lint_cmd, capture_output=True, text=True)
-            
-            if process.returncode != 0:
-                results["errors"].append(process.stderr or process.stdout)
-                results["status"] = "issues_found"
-            else:
-                results["lint_score"] = 10.0 # Placeholder for perfect score
-                
-        except FileNotFoundError:
+        # flake8 and pytest are independent, so run both child processes at once
+        lint, tests = await asyncio.gather(self._run_flake8(full_path), self._run_pytest(full_path))
+        
+        # 1. Linter (Flake8)
+        if lint is None:
             print("[Critic] Flake8 not found. Skipping linting.")
             results["errors"].append("Flake8 not installed")
+        elif lint[0] != 0:
+            results["errors"].append(lint[2] or lint[1])
+            results["status"] = "issues_found"
+        else:
+            results["lint_score"] = 10.0 # Placeholder for perfect score
+
+        # 2. Tests (Pytest)
+        if tests is None:
+            print("[Critic] Pytest not found. Skipping tests.")
+        else:
+            results["test_output"] = tests[1]
+            if tests[0] != 0:
+                results["status"] = "tests_failed"
+        
+        self._review_cache[key] = (time.monotonic() + REVIEW_CACHE_TTL, copy.deepcopy(results))
+        if len(self._review_cache) > REVIEW_CACHE_SIZE:
+            self._review_cache.popitem(last=False)
+        return results
+
+    def _cached_review(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of a fresh cached review, or None."""
+        entry = self._review_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._review_cache[key]
+            return None
+        self._review_cache.move_to_end(key)
+        return copy.deepcopy(entry[1])
 
-        # 2. Run Tests (Pytest)
+    async def _run_flake8(self, full_path: str) -> Optional[Tuple[int, str, str]]:
+        print(f"[Critic] Running linter on {full_path}...")
+        lint_cmd = ["flake8", full_path, "--count", "--select=E9,F63,F7,F82", "--show-source", "--statistics"]
+        return await self._run_command(lint_cmd)
+
+    async def _run_pytest(self, full_path: str) -> Optional[Tuple[int, str, str]]:
         print(f"[Critic] Running tests on {full_path}...")
+        return await self._run_command(["pytest", full_path, "-q"])
+
+    @staticmethod
+    async def _run_command(cmd: List[str]) -> Optional[Tuple[int, str, str]]:
+        """Run a command without blocking the event loop; None if it isn't installed."""
         try:
-            test_cmd = ["pytest", full_path, "-q"]
-            process = subprocess.run(test_cmd, capture_output=True, text=True)
-            
-            results["test_output"] = process.stdout
-            if process.returncode != 0:
-                results["status"] = "tests_failed"
+            process = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
         except FileNotFoundError:
-             print("[Critic] Pytest not found. Skipping tests.")
-             
-        return results
+            return None
+        stdout, stderr = await process.communicate()
+        return process.returncode, stdout.decode(errors="replace"), stderr.decode(errors="replace")
 
 # Expose a standalone entry point if needed
 if __name__ == "__main__":
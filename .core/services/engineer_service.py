@@ -10,8 +10,18 @@ import json
 import asyncio
 from typing import List, Optional, Dict, Any
 from pydantic import BaseModel
+import httpx
 import litellm
 
+# Optional: route litellm's OpenAI-compatible calls over one shared aiohttp pool,
+# which holds up far better than httpx under concurrent requests
+try:
+    import aiohttp
+    from litellm.llms.custom_httpx.aiohttp_transport import LiteLLMAiohttpTransport
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
 import sys
 # Ensure we can import libraries similarly to original file
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib")))
@@ -19,10 +29,10 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "../lib"
 from governor import governed, ActionType, get_governor
 
 try:
-    from ..config import DEFAULT_MODEL
+    from ..config import DEFAULT_MODEL, DEFAULT_TIMEOUT, LLM_MAX_CONNECTIONS, ENGINEER_MAX_CONCURRENCY
     from .base_service import BaseAgentService
 except ImportError:
-    from .core.config import DEFAULT_MODEL
+    from .core.config import DEFAULT_MODEL, DEFAULT_TIMEOUT, LLM_MAX_CONNECTIONS, ENGINEER_MAX_CONCURRENCY
     from .core.services.base_service import BaseAgentService
 
 # --- MODELS ---
@@ -57,8 +67,49 @@ Do not wrap in markdown code blocks unless requested.
 
 class EngineerService(BaseAgentService):
     def __init__(self):
-        super().__init__(agent_id="engineer-1", agent_type="engineer", capabilities=["code-generation", "refactoring", "polishing"])
+        super().__init__(
+            agent_id="engineer-1",
+            agent_type="engineer",
+            capabilities=["code-generation", "refactoring", "polishing"],
+            max_concurrent_tasks=ENGINEER_MAX_CONCURRENCY
+        )
         self.governor = get_governor()
+        # Bounds in-flight LLM generations across polled and batched work
+        self._generation_slots = asyncio.Semaphore(ENGINEER_MAX_CONCURRENCY)
+        self._llm_session = None  # aiohttp.ClientSession, lives as long as the service
+
+    async def start(self):
+        """Open the shared LLM transport for the service lifetime."""
+        self._open_llm_transport()
+        try:
+            await super().start()
+        finally:
+            await self._close_llm_transport()
+
+    async def stop(self):
+        await super().stop()
+        await self._close_llm_transport()
+
+    def _open_llm_transport(self):
+        """Point litellm at a single pooled aiohttp session (no-op without aiohttp)."""
+        if not HAS_AIOHTTP or self._llm_session is not None:
+            return
+        self._llm_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=LLM_MAX_CONNECTIONS)
+        )
+        litellm.aclient_session = httpx.AsyncClient(
+            transport=LiteLLMAiohttpTransport(client=self._llm_session),
+            timeout=DEFAULT_TIMEOUT,
+        )
+
+    async def _close_llm_transport(self):
+        if self._llm_session is None:
+            return
+        session, self._llm_session = self._llm_session, None
+        client, litellm.aclient_session = litellm.aclient_session, None
+        if client is not None:
+            await client.aclose()
+        await session.close()
 
     async def process_task(self, task: Dict[str, Any]):
         """
@@ -121,6 +172,17 @@ class EngineerService(BaseAgentService):
             print(f"[Engineer] Task failed: {e}")
             await self.update_task(task['id'], "failed", {"error": str(e)})
 
+    async def generate_batch(self, reqs: List[CodeGenerationRequest]) -> List[Any]:
+        """
+        Generate code for several requests concurrently.
+        Results keep the input order; a failed generation is returned as its exception.
+        """
+        async def generate(req: CodeGenerationRequest) -> CodeGenerationResponse:
+            # The Governor check raises on call, so keep it inside the awaited coroutine
+            return await self.generate_code(req)
+
+        return await asyncio.gather(*(generate(r) for r in reqs), return_exceptions=True)
+
     @governed(ActionType.LLM_CALL, lambda args: args[1].task_text if len(args) > 1 else "Unknown Task")
     async def generate_code(self, req: CodeGenerationRequest) -> CodeGenerationResponse:
         """Core generation logic with Governor."""
@@ -138,13 +200,14 @@ class EngineerService(BaseAgentService):
         if req.file_path:
             user_prompt += f"Target File: {req.file_path}\n"
 
-        response = await litellm.acompletion(
-            model=DEFAULT_MODEL,
-            messages=[
-                {"role": "system", "content": ENGINEER_SYSTEM_PROMPT},
-                {"role": "user", "content": user_prompt}
-            ]
-        )
+        async with self._generation_slots:
+            response = await litellm.acompletion(
+                model=DEFAULT_MODEL,
+                messages=[
+                    {"role": "system", "content": ENGINEER_SYSTEM_PROMPT},
+                    {"role": "user", "content": user_prompt}
+                ]
+            )
         
         content = response.choices[0].message.content
         code = self._extract_code(content)
@@ -18,6 +18,21 @@ except ImportError:
     from config import WORKSPACE_DIR, DOCS_DIR
 from .vector_store import VectorStore, FileHash
 
+HASH_CHUNK_SIZE = 64 * 1024  # docs are hashed in chunks so memory stays flat
+
+
+def file_hash(path: str) -> str:
+    """
+    SHA-256 of a file's bytes, read in chunks. The algorithm is fixed (not
+    optional) so stored hashes stay comparable across installs.
+    """
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            h.update(chunk)
+    return h.hexdigest()
+
+
 class FileManager:
     def __init__(self, vector_store: VectorStore):
         self.cortex = vector_store
@@ -78,10 +93,11 @@ class FileManager:
         
         try:
             if self.tbl_hashes:
-                stored_hashes = {
-                    row["file_path"]: row["content_hash"] 
-                    for row in self.tbl_hashes.to_pandas().to_dict('records')
-                }
+                hashes = self.tbl_hashes.to_arrow()
+                stored_hashes = dict(zip(
+                    hashes.column("file_path").to_pylist(),
+                    hashes.column("content_hash").to_pylist()
+                ))
             else:
                 stored_hashes = {}
         except Exception as e:
@@ -93,13 +109,17 @@ class FileManager:
                 if not file.endswith(".md"): continue
                 full_path = os.path.join(root, file)
                 try:
-                    with open(full_path, "r", encoding="utf-8") as f:
-                        content = f.read()
+                    current_hash = file_hash(full_path)
                 except Exception:
                     continue
                     
-                current_hash = hashlib.md5(content.encode()).hexdigest()
                 if full_path not in stored_hashes or stored_hashes[full_path] != current_hash:
+                    # Only changed docs are read in full for embedding
+                    try:
+                        with open(full_path, "r", encoding="utf-8") as f:
+                            content = f.read()
+                    except Exception:
+                        continue
                     print(f"[+] Syncing file: {file}")
                     meta = {"source": full_path, "hash": current_hash}
                     self.cortex.add(content, "knowledge", meta)
@@ -7,8 +7,9 @@ import uuid
 from typing import List, Optional, Dict, Any
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 # --- IMPORTS ---
@@ -17,23 +18,25 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 try:
-    from config import DB_URI, SQLITE_DB, SYNC_INTERVAL, WORKSPACE_DIR
+    from config import DB_URI, SQLITE_DB, SYNC_INTERVAL, WORKSPACE_DIR, LONG_POLL_TIMEOUT, LONG_POLL_MAX_TASKS
     from models import AgentState, VALID_TRANSITIONS
     from services.vector_store import VectorStore, MemoryEntry
     from services.file_manager import FileManager
     from services.task_manager import TaskManager, TaskCreateRequest, TaskUpdateRequest, TaskClaimRequest
     from services.state_manager import StateManager, StateUpdateRequest
     from services.research_manager import ResearchManager, SourceAddRequest
+    from lib.metrics import get_metrics, agent_heartbeat
 except ImportError as e:
     print(f"[!] Import Error: {e}")
     # Fallback if structure is different
-    from ..config import DB_URI, SQLITE_DB, SYNC_INTERVAL, WORKSPACE_DIR
+    from ..config import DB_URI, SQLITE_DB, SYNC_INTERVAL, WORKSPACE_DIR, LONG_POLL_TIMEOUT, LONG_POLL_MAX_TASKS
     from ..models import AgentState
     from .vector_store import VectorStore
     from .file_manager import FileManager
     from .task_manager import TaskManager
     from .state_manager import StateManager
     from .research_manager import ResearchManager
+    from ..lib.metrics import get_metrics, agent_heartbeat
 
 # --- GLOBAL SERVICE CONTAINER ---
 class ServiceContainer:
@@ -45,6 +48,34 @@ class ServiceContainer:
 
 services = ServiceContainer()
 
+class TaskSignal:
+    """
+    Wakes held long-polls when the task table changes. `notify` may be
+    called from the threadpool that runs sync endpoints.
+    """
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._event: Optional[asyncio.Event] = None
+    
+    def bind(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._event = asyncio.Event()
+    
+    def current(self) -> asyncio.Event:
+        """Event set by the next notify; take it *before* checking for tasks."""
+        return self._event
+    
+    def notify(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake)
+    
+    def _wake(self):
+        # Swap in a fresh event so later waiters block until the next change
+        event, self._event = self._event, asyncio.Event()
+        event.set()
+
+task_signal = TaskSignal()
+
 # --- BACKGROUND TASKS ---
 async def doc_sync_loop():
     """Background loop for file syncing."""
@@ -69,6 +100,7 @@ async def lifespan(app: FastAPI):
     services.tasks = TaskManager(SQLITE_DB)
     services.state = StateManager(services.cortex)
     services.research = ResearchManager(SQLITE_DB, services.cortex)
+    task_signal.bind(asyncio.get_running_loop())
     
     # Start Background Loop
     asyncio.create_task(doc_sync_loop())
@@ -109,6 +141,26 @@ class ReflectRequest(BaseModel):
     pattern: str
     solution: Optional[str] = None
 
+class ClaimContextRequest(BaseModel):
+    assignee: str
+    agent_id: str
+    query_limit: int = 3
+    filter_type: Optional[str] = "knowledge"
+    new_state: AgentState = AgentState.EXECUTING
+
+class TaskBulkUpdateRequest(BaseModel):
+    updates: List[TaskUpdateRequest]
+
+class TaskFinishRequest(BaseModel):
+    task_id: str
+    status: str
+    metadata: dict = {}
+    next_state: Optional[AgentState] = None
+    file_path: Optional[str] = None
+    file_content: Optional[str] = None
+    memory_text: Optional[str] = None
+    memory_metadata: dict = {}
+
 # --- ENDPOINTS: STATE ---
 
 @app.get("/state")
@@ -226,6 +278,7 @@ async def write_file(req: FileWriteRequest):
 @app.post("/tasks/create")
 def create_task(req: TaskCreateRequest):
     task_id = services.tasks.create_task(req)
+    task_signal.notify()
     # Log creation
     services.cortex.add(f"New Task Created: {req.text}", "episodic", {"task_id": task_id})
     return {"status": "success", "task_id": task_id}
@@ -243,6 +296,7 @@ def claim_task(req: TaskClaimRequest):
 @app.post("/tasks/update")
 def update_task_endpoint(req: TaskUpdateRequest):
     res = services.tasks.update_task(req)
+    task_signal.notify()
     # Log update
     msg = f"Task {req.task_id} updated to '{req.status}'"
     services.cortex.add(
@@ -251,6 +305,63 @@ def update_task_endpoint(req: TaskUpdateRequest):
     )
     return res
 
+@app.post("/tasks/bulk_update")
+def bulk_update_tasks(req: TaskBulkUpdateRequest):
+    """Apply several task updates in one request (unknown task IDs are reported, not fatal)."""
+    missing = []
+    for update in req.updates:
+        try:
+            update_task_endpoint(update)
+        except HTTPException:
+            missing.append(update.task_id)
+    return {"status": "success", "updated": len(req.updates) - len(missing), "missing": missing}
+
+@app.post("/tasks/claim_and_context")
+def claim_and_context(req: ClaimContextRequest):
+    """
+    Claim the first pending task for `assignee`, transition the system state,
+    and fetch memory context for the task text, all in one round trip.
+    """
+    for task in services.tasks.list_tasks("pending", req.assignee):
+        try:
+            claim_task(TaskClaimRequest(task_id=task["id"], agent_id=req.agent_id))
+        except HTTPException:
+            continue  # Claimed by someone else in the meantime
+        state = update_state(StateUpdateRequest(new_state=req.new_state))
+        context = query_memory(QueryRequest(text=task["text"], limit=req.query_limit, filter_type=req.filter_type))
+        return {"task": task, "context": context.get("results", []), "new_state": state["current_state"]}
+    return {"task": None, "context": [], "new_state": services.state.get_state()}
+
+def _finish_task(req: TaskFinishRequest) -> Dict[str, Any]:
+    # Both checks run before either write, so an unknown task (404) or an
+    # invalid transition (400) leaves task and state untouched
+    if req.next_state is not None:
+        services.state.check_transition(req.next_state)
+    update_task_endpoint(TaskUpdateRequest(task_id=req.task_id, status=req.status, metadata=req.metadata))
+    state = services.state.get_state()
+    if req.next_state is not None:
+        state = update_state(StateUpdateRequest(new_state=req.next_state))["current_state"]
+    if req.memory_text:
+        services.cortex.add(req.memory_text, "episodic", req.memory_metadata)
+    return {"status": "success", "current_state": state}
+
+@app.post("/tasks/finish")
+async def finish_task(req: TaskFinishRequest):
+    """
+    Bundle the end of a work step: optionally write a result file, then
+    update the task, transition state, and record an episodic memory.
+    """
+    if req.file_path is not None:
+        await services.files.write_file(req.file_path, req.file_content or "")
+    return await asyncio.to_thread(_finish_task, req)
+
+@app.get("/tasks/resolve/{prefix}")
+def resolve_task(prefix: str, status: Optional[str] = None, assignee: Optional[str] = None):
+    task_id = services.tasks.resolve_task_id(prefix, status, assignee)
+    if not task_id:
+        raise HTTPException(404, "Task not found or prefix ambiguous")
+    return {"task_id": task_id}
+
 @app.get("/tasks/list")
 def list_tasks(status: Optional[str] = None, assignee: Optional[str] = None):
     return {"tasks": services.tasks.list_tasks(status, assignee)}
@@ -274,25 +385,64 @@ def register_agent(req: AgentRegistration):
     )
     return {"status": "success"}
 
+def _touch_agent(agent_id: str) -> bool:
+    """Record that an agent was just heard from (heartbeat or task poll)."""
+    agent = registered_agents.get(agent_id)
+    if agent is None:
+        return False
+    agent["last_heartbeat"] = time.time()
+    agent["status"] = "online"
+    agent_heartbeat(agent_id)
+    return True
+
 @app.post("/agents/heartbeat/{agent_id}")
 def heartbeat(agent_id: str):
-    if agent_id in registered_agents:
-        registered_agents[agent_id]["last_heartbeat"] = time.time()
-        registered_agents[agent_id]["status"] = "online"
+    if _touch_agent(agent_id):
         return {"status": "ok"}
     raise HTTPException(404, "Agent not registered")
 
 @app.get("/agents/{agent_id}/next")
-def get_next_task(agent_id: str):
-    task = services.tasks.get_next_task(agent_id)
-    if task:
-        services.cortex.add(
-            f"Agent '{agent_id}' auto-claimed task {task['id']}", 
-            "episodic", 
-            {"task_id": task["id"], "agent": agent_id}
-        )
-        return {"task": task, "claimed": True}
-    return {"task": None}
+async def get_next_task(
+    agent_id: str, wait: float = 0,
+    limit: int = Query(1, alias="max", ge=1, le=LONG_POLL_MAX_TASKS)
+):
+    """
+    Claim the next pending task(s) for an agent.
+    With wait > 0 the request is held open (long-poll) until a task
+    appears or `wait` seconds (capped at LONG_POLL_TIMEOUT) elapse; the
+    task table is only re-checked when a task is created or updated.
+    `max` claims up to that many tasks at once; `task` is the first of them.
+    Polling doubles as the agent's heartbeat.
+    """
+    _touch_agent(agent_id)
+    deadline = time.monotonic() + min(max(wait, 0), LONG_POLL_TIMEOUT)
+    while True:
+        changed = task_signal.current()
+        tasks = await asyncio.to_thread(services.tasks.get_next_tasks, agent_id, limit)
+        remaining = deadline - time.monotonic()
+        if tasks or remaining <= 0 or changed is None:
+            break
+        try:
+            await asyncio.wait_for(changed.wait(), remaining)
+        except asyncio.TimeoutError:
+            pass
+    if tasks:
+        # Embedding/flushing blocks, so keep it off the loop serving held polls
+        await asyncio.to_thread(services.cortex.add_batch, [
+            {
+                "text": f"Agent '{agent_id}' auto-claimed task {task['id']}",
+                "type": "episodic",
+                "metadata": {"task_id": task["id"], "agent": agent_id}
+            }
+            for task in tasks
+        ])
+        return {"task": tasks[0], "tasks": tasks, "claimed": True}
+    return {"task": None, "tasks": []}
+
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus scrape endpoint, streamed line by line."""
+    return StreamingResponse(get_metrics().prometheus_iter(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 def health_check():
@@ -32,6 +32,15 @@ except ImportError:
 
 INCOMING_DIR = os.path.join(WORKSPACE_DIR, "incoming")
 
+# Outbound web traffic shares one pooled client per service
+HTTP_TIMEOUTS = {"connect": 5.0, "read": 30.0, "write": 10.0, "pool": 5.0}
+HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100)
+
+
+def new_web_client() -> httpx.AsyncClient:
+    """Create a pooled AsyncClient for outbound web requests."""
+    return httpx.AsyncClient(timeout=httpx.Timeout(**HTTP_TIMEOUTS), limits=HTTP_LIMITS)
+
 @dataclass
 class SearchResult:
     title: str
@@ -56,9 +65,11 @@ class ScoutService(BaseAgentService):
     The Scout Agent: Performs web research and delivers results to the Librarian.
     """
     
-    def __init__(self):
+    def __init__(self, web_client: Optional[httpx.AsyncClient] = None):
         super().__init__(agent_id="scout-1", agent_type="scout", capabilities=["research", "web-scraping", "ingestion"])
-        self.web_client = httpx.AsyncClient(timeout=30.0)
+        # An injected client belongs to the caller, who closes it
+        self._owns_web_client = web_client is None
+        self.web_client = web_client or new_web_client()
         os.makedirs(INCOMING_DIR, exist_ok=True)
         
     async def process_task(self, task: Dict[str, Any]):
@@ -214,7 +225,8 @@ class ScoutService(BaseAgentService):
         return {"topic": topic, "saved": saved}
 
     async def close(self):
-        await self.web_client.aclose()
+        if self._owns_web_client:
+            await self.web_client.aclose()
         await super().stop()
 
 if __name__ == "__main__":
@@ -24,15 +24,19 @@ class StateManager:
     def get_state(self) -> AgentState:
         return self.current_state
 
-    def update_state(self, req: StateUpdateRequest) -> Dict[str, Any]:
-        """Update system state with transition validation."""
+    def check_transition(self, new_state: AgentState):
+        """Raise 400 if the current state may not move to `new_state`."""
         allowed = VALID_TRANSITIONS.get(self.current_state, [])
-        if req.new_state not in allowed:
+        if new_state not in allowed:
             # Special case: Allow reset to IDLE from anywhere if needed (optional safety)
-            if req.new_state == AgentState.IDLE:
+            if new_state == AgentState.IDLE:
                 pass
             else:
-                raise HTTPException(400, f"Invalid transition from {self.current_state} to {req.new_state}")
+                raise HTTPException(400, f"Invalid transition from {self.current_state} to {new_state}")
+
+    def update_state(self, req: StateUpdateRequest) -> Dict[str, Any]:
+        """Update system state with transition validation."""
+        self.check_transition(req.new_state)
         
         old_state = self.current_state
         self.current_state = req.new_state
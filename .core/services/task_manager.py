@@ -115,25 +115,50 @@ class TaskManager:
         self.sql_conn.commit()
         return {"status": "success"}
 
+    def resolve_task_id(self, prefix: str, status: Optional[str] = None, assignee: Optional[str] = None) -> Optional[str]:
+        """
+        Resolve a task ID prefix to the full ID (None if unknown or ambiguous),
+        optionally among tasks with the given status and assignee only.
+        """
+        if not prefix:
+            return None
+        escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        query = "SELECT id FROM tasks WHERE id LIKE ? ESCAPE '\\'"
+        params = [escaped + "%"]
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        if assignee:
+            query += " AND assignee = ?"
+            params.append(assignee)
+        cur = self.sql_conn.cursor()
+        cur.execute(query + " LIMIT 2", params)
+        rows = cur.fetchall()
+        return rows[0]["id"] if len(rows) == 1 else None
+
     def get_next_task(self, agent_id: str) -> Optional[Dict]:
+        tasks = self.get_next_tasks(agent_id, 1)
+        return tasks[0] if tasks else None
+
+    def get_next_tasks(self, agent_id: str, limit: int = 1) -> List[Dict]:
+        """Claim up to `limit` pending tasks for an agent in one transaction."""
         cur = self.sql_conn.cursor()
         # Simple heuristic: Pending tasks assigned to agent
         cur.execute(
-            "SELECT * FROM tasks WHERE assignee = ? AND status = 'pending' ORDER BY created_at ASC LIMIT 1",
-            (agent_id,)
+            "SELECT * FROM tasks WHERE assignee = ? AND status = 'pending' ORDER BY created_at ASC LIMIT ?",
+            (agent_id, max(1, limit))
         )
-        row = cur.fetchone()
-        if not row: return None
+        tasks = [dict(row) for row in cur.fetchall()]
+        if not tasks: return []
         
-        task = dict(row)
         # Auto-claim
         now = time.time()
-        cur.execute(
+        cur.executemany(
             "UPDATE tasks SET status = 'in_progress', claimed_by = ?, updated_at = ? WHERE id = ?",
-            (agent_id, now, task["id"])
+            [(agent_id, now, task["id"]) for task in tasks]
         )
         self.sql_conn.commit()
-        return task
+        return tasks
 
     def close(self):
         self.sql_conn.close()
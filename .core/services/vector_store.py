@@ -87,6 +87,39 @@ class VectorStore:
             
         return entry_id
 
+    def add_batch(self, items: List[Dict[str, Any]]) -> List[str]:
+        """
+        Add several entries ({text, type, metadata}) at once.
+        Non-episodic entries are embedded and written in a single table add.
+        """
+        ids = []
+        direct = []
+        now = time.time()
+        for item in items:
+            metadata = dict(item.get("metadata") or {})
+            entry_id = str(uuid.uuid4())
+            entry = {
+                "id": entry_id,
+                "text": item["text"],
+                "type": item["type"],
+                "metadata": None,
+                "timestamp": now
+            }
+            if item["type"] == "episodic":
+                metadata["prev_id"] = self.last_episodic_id
+                self.buffer.append(entry)
+                self.last_episodic_id = entry_id
+            else:
+                direct.append(entry)
+            entry["metadata"] = json.dumps(metadata)
+            ids.append(entry_id)
+        
+        if direct:
+            self.tbl.add(direct)
+        if len(self.buffer) >= BUFFER_SIZE:
+            self.flush()
+        return ids
+
     def flush(self):
         """Flush buffer to long-term memory."""
         if not self.buffer: return
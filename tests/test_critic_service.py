@@ -1,5 +1,6 @@
 
 import pytest
+import asyncio
 from unittest.mock import MagicMock, patch
 import sys
 import os
@@ -14,9 +15,15 @@ if 'httpx' not in sys.modules:
 from services import critic_service
 
 @pytest.fixture
-def mock_subprocess():
-    with patch('services.critic_service.subprocess.run') as mock:
-        yield mock
+def mock_run():
+    """Replace the flake8/pytest subprocesses with canned (returncode, stdout, stderr) results."""
+    outputs = {}
+    
+    async def fake_run(cmd):
+        return outputs[cmd[0]]
+    
+    with patch.object(critic_service.CriticService, '_run_command', staticmethod(fake_run)):
+        yield outputs
 
 @pytest.fixture
 def mock_exists():
@@ -24,36 +31,54 @@ def mock_exists():
         mock.return_value = True
         yield mock
 
-def test_review_task_success(mock_subprocess, mock_exists):
-    # Setup mocks
+def test_review_task_success(mock_run, mock_exists):
     # returncode=0 means success
-    mock_subprocess.return_value.returncode = 0
-    mock_subprocess.return_value.stdout = "Success"
-    mock_subprocess.return_value.stderr = ""
+    mock_run['flake8'] = (0, "Success", "")
+    mock_run['pytest'] = (0, "Success", "")
     
     service = critic_service.CriticService("test_repo")
-    result = service.review_task({'id': '1', 'type': 'REVIEW', 'metadata': {'repo_path': '.'}})
+    result = asyncio.run(service._perform_review({'id': '1', 'type': 'REVIEW', 'metadata': {'repo_path': '.'}}))
     
     assert result['status'] == 'pass'
     assert result['lint_score'] == 10.0
 
-def test_review_task_issues_found(mock_subprocess, mock_exists):
-    # Setup mock: Linter fails (1), Tests pass (0)
-    mock_subprocess.side_effect = [
-        MagicMock(returncode=1, stdout="Linting errors", stderr="Error details"),
-        MagicMock(returncode=0, stdout="Tests passed", stderr="")
-    ]
+def test_review_task_issues_found(mock_run, mock_exists):
+    # Linter fails (1), Tests pass (0)
+    mock_run['flake8'] = (1, "Linting errors", "Error details")
+    mock_run['pytest'] = (0, "Tests passed", "")
     
     service = critic_service.CriticService("test_repo")
-    result = service.review_task({'id': '1', 'type': 'REVIEW', 'metadata': {'repo_path': '.'}})
+    result = asyncio.run(service._perform_review({'id': '1', 'type': 'REVIEW', 'metadata': {'repo_path': '.'}}))
     
     assert result['status'] == 'issues_found'
-    assert len(result['errors']) > 0
+    assert result['errors'] == ["Error details"]
 
 def test_path_not_found():
     service = critic_service.CriticService("test_repo")
     # Provide a non-existent path
-    result = service.review_task({'id': '1', 'type': 'REVIEW', 'metadata': {'repo_path': 'non_existent_path_12345'}})
+    result = asyncio.run(service._perform_review({'id': '1', 'type': 'REVIEW', 'metadata': {'repo_path': 'non_existent_path_12345'}}))
+    
+    assert result['status'] == 'failed'
+    assert 'Path not found' in result['errors'][0]
+
+
+def test_unchanged_code_review_is_cached(tmp_path):
+    """Unchanged code is not linted and tested a second time."""
+    (tmp_path / "app.py").write_text("x = 1\n")
+    service = critic_service.CriticService(str(tmp_path))
+    calls = []
+    
+    async def fake_run(cmd):
+        calls.append(cmd[0])
+        return 0, "ok", ""
     
-    assert 'error' in result
-    assert 'Path not found' in result['error']
\ No newline at end of file
+    with patch.object(service, '_run_command', fake_run):
+        first = asyncio.run(service._perform_review({'id': '1', 'metadata': {'repo_path': '.'}}))
+        first["errors"].append("mutated by caller")
+        second = asyncio.run(service._perform_review({'id': '2', 'metadata': {'repo_path': '.'}}))
+        assert calls == ['flake8', 'pytest']
+        assert second == {'lint_score': 10.0, 'errors': [], 'status': 'pass', 'test_output': 'ok'}
+        
+        (tmp_path / "app.py").write_text("x = 2  # changed\n")
+        asyncio.run(service._perform_review({'id': '3', 'metadata': {'repo_path': '.'}}))
+        assert calls == ['flake8', 'pytest'] * 2
@@ -0,0 +1,204 @@
+"""
+Unit Tests for the Governor
+===========================
+Tests risk assessment, rate limiting, and escalation handling.
+"""
+
+import pytest
+import json
+import os
+import sys
+
+# Add .core/lib to path for imports
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".core", "lib")))
+
+import governor
+from governor import Governor, GovernorPolicy, ActionType, RiskLevel, RateLimiter
+
+
+class TestGovernor:
+    """Test suite for Governor class."""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        """Redirect audit/reject logs into a temporary directory."""
+        monkeypatch.setattr(governor, "AUDIT_LOG_PATH", str(tmp_path / "audit.jsonl"))
+        monkeypatch.setattr(governor, "REJECT_LOG_PATH", str(tmp_path / "rejects.md"))
+        self.log_dir = tmp_path
+        self.gov = Governor()
+        yield
+        self.gov.close()
+    
+    def test_blocked_file_patterns_are_critical(self):
+        """Test that blocked glob patterns block file writes."""
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, ".env") == RiskLevel.CRITICAL
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "certs/server.KEY") == RiskLevel.CRITICAL
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "./workspace/my_secret.txt") == RiskLevel.CRITICAL
+    
+    def test_literal_patterns_match_anywhere_in_path(self):
+        """Test that literal blocked patterns are substring matches."""
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "workspace/.git/config") == RiskLevel.CRITICAL
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "./workspace/node_modules/x.js") == RiskLevel.CRITICAL
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "workspace/app/.ENV") == RiskLevel.CRITICAL
+    
+    def test_allowed_write_paths_are_low(self):
+        """Test whitelisted write paths with and without the ./ prefix."""
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "./workspace/out.md") == RiskLevel.LOW
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "workspace/out.md") == RiskLevel.LOW
+        assert self.gov.assess_risk(ActionType.FILE_WRITE, "src/main.py") == RiskLevel.MEDIUM
+    
+    def test_shell_commands(self):
+        """Test shell command blacklist/whitelist handling."""
+        assert self.gov.assess_risk(ActionType.SHELL_COMMAND, "RM -RF /") == RiskLevel.CRITICAL
+        assert self.gov.assess_risk(ActionType.SHELL_COMMAND, "Git Status") == RiskLevel.LOW
+        assert self.gov.assess_risk(ActionType.SHELL_COMMAND, "make build") == RiskLevel.HIGH
+    
+    def test_other_action_types(self):
+        """Test fixed-risk action types."""
+        assert self.gov.assess_risk(ActionType.FILE_DELETE, "workspace/a.txt") == RiskLevel.HIGH
+        assert self.gov.assess_risk(ActionType.LLM_CALL, "hello") == RiskLevel.LOW
+        assert self.gov.assess_risk(ActionType.HTTP_REQUEST, "http://localhost:8000") == RiskLevel.LOW
+        assert self.gov.assess_risk(ActionType.HTTP_REQUEST, "https://example.com") == RiskLevel.MEDIUM
+    
+    def test_set_policy_regenerates_rules(self):
+        """Test that swapping the policy replaces the specialized risk rules."""
+        self.gov.set_policy(GovernorPolicy(blocked_commands=["make"], allowed_commands=["ls"]))
+        
+        assert self.gov.assess_risk(ActionType.SHELL_COMMAND, "make build") == RiskLevel.CRITICAL
+        assert self.gov.assess_risk(ActionType.SHELL_COMMAND, "rm -rf /") == RiskLevel.HIGH
+        assert self.gov.assess_risk(ActionType.SHELL_COMMAND, "ls -la") == RiskLevel.LOW
+    
+    def test_only_pattern_rules_are_memoized(self):
+        """Test that shell/file decisions are cached but LLM prompts are not."""
+        self.gov.check_action(ActionType.SHELL_COMMAND, "git status", "agent-a")
+        self.gov.check_action(ActionType.SHELL_COMMAND, "git status", "agent-a")
+        self.gov.check_action(ActionType.LLM_CALL, "a long unique prompt", "agent-a")
+        
+        assert self.gov._risk_fns[ActionType.SHELL_COMMAND].cache_info().hits == 1
+        assert not hasattr(self.gov._risk_fns[ActionType.LLM_CALL], "cache_info")
+    
+    def test_check_action_escalates_high_risk(self):
+        """Test that high-risk actions land in the escalation queue."""
+        allowed, _ = self.gov.check_action(ActionType.SHELL_COMMAND, "make build", "agent-a")
+        
+        assert allowed is False
+        pending = self.gov.get_pending_escalations()
+        assert len(pending) == 1
+        assert pending[0]["agent_id"] == "agent-a"
+        
+        assert self.gov.approve_escalation(0)
+        assert self.gov.get_pending_escalations() == []
+    
+    def test_escalation_indices_are_stable(self):
+        """Test that resolving one escalation doesn't renumber the others."""
+        self.gov.check_action(ActionType.SHELL_COMMAND, "make a", "agent-a")
+        self.gov.check_action(ActionType.SHELL_COMMAND, "make b", "agent-b")
+        
+        assert self.gov.reject_escalation(0)
+        pending = self.gov.get_pending_escalations()
+        assert [(e["index"], e["agent_id"]) for e in pending] == [(1, "agent-b")]
+        assert not self.gov.approve_escalation(2)
+        assert self.gov.get_stats()["pending_escalations"] == 1
+    
+    def test_check_action_rejects_critical(self):
+        """Test that critical actions are blocked outright."""
+        allowed, reason = self.gov.check_action(ActionType.FILE_WRITE, ".env", "agent-a")
+        
+        assert allowed is False
+        assert "Critical" in reason
+    
+    def test_audit_entries_are_written(self):
+        """Test that queued audit entries reach the log file."""
+        self.gov.check_action(ActionType.LLM_CALL, "hello", "agent-a")
+        self.gov.check_action(ActionType.FILE_WRITE, ".env", "agent-a")
+        self.gov.flush_audit()
+        
+        lines = (self.log_dir / "audit.jsonl").read_text(encoding="utf-8").splitlines()
+        entries = [json.loads(line) for line in lines]
+        assert [e["decision"] for e in entries] == ["APPROVED", "REJECTED"]
+        assert entries[1]["action_type"] == "file_write"
+    
+    def test_audit_writes_keep_lines_whole(self, monkeypatch):
+        """Test that chunked audit writes never split a line."""
+        monkeypatch.setattr(governor, "AUDIT_ATOMIC_WRITE", 25)
+        writes = []
+        monkeypatch.setattr(governor.os, "write", lambda fd, data: writes.append(bytes(data)) or len(data))
+        
+        self.gov._write_audit_lines([b"0123456789\n"] * 5)
+        
+        assert writes == [b"0123456789\n" * 2] * 2 + [b"0123456789\n"]
+    
+    def test_short_writes_are_retried(self, monkeypatch):
+        """Test that a partial os.write is continued until the whole chunk is out."""
+        writes = []
+        monkeypatch.setattr(governor.os, "write", lambda fd, data: writes.append(bytes(data[:4])) or min(len(data), 4))
+        
+        self.gov._write_audit_lines([b"0123456789\n"])
+        
+        assert b"".join(writes) == b"0123456789\n"
+    
+    def test_oversized_entries_are_truncated(self, monkeypatch):
+        """Test that an entry is cut to fit one atomic write and stays valid JSON."""
+        monkeypatch.setattr(governor, "AUDIT_ATOMIC_WRITE", 300)
+        entry = governor.AuditEntry(
+            timestamp="t", action_type=ActionType.SHELL_COMMAND, agent_id="a",
+            action_detail="\u00e9\"" * 500, risk_level=RiskLevel.LOW, decision="APPROVED", reason="r"
+        )
+        
+        line = self.gov._serialize_audit(entry)
+        
+        assert len(line) <= 300 and line.endswith(b"\n")
+        record = json.loads(line)
+        assert record["truncated"] is True
+        assert record["checksum"] == entry.checksum
+    
+    def test_close_flushes_and_stops_writer(self):
+        """Test that close writes pending entries and releases the thread and fd."""
+        self.gov.check_action(ActionType.LLM_CALL, "hello", "agent-a")
+        self.gov.close()
+        self.gov.close()
+        
+        assert not self.gov._audit_thread.is_alive()
+        assert len((self.log_dir / "audit.jsonl").read_text(encoding="utf-8").splitlines()) == 1
+        
+        self.gov.check_action(ActionType.LLM_CALL, "late", "agent-a")
+        assert self.gov.get_stats()["audit_dropped"] == 1
+
+
+class TestGovernedDecorator:
+    """Test suite for the @governed decorator."""
+    
+    @pytest.fixture(autouse=True)
+    def setup(self, tmp_path, monkeypatch):
+        """Use a fresh singleton with a tiny LLM budget."""
+        monkeypatch.setattr(governor, "AUDIT_LOG_PATH", str(tmp_path / "audit.jsonl"))
+        monkeypatch.setattr(governor, "_governor_instance", Governor(GovernorPolicy(llm_rate_limit=1)))
+        yield
+        governor._governor_instance.close()
+    
+    def test_rate_limit_shared_across_calls(self):
+        """Test that the decorator reuses the singleton so limits apply."""
+        @governor.governed(ActionType.LLM_CALL, lambda args: args[0])
+        def ask(prompt):
+            return prompt
+        
+        assert ask("first") == "first"
+        with pytest.raises(PermissionError):
+            ask("second")
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter class."""
+    
+    def test_limit_is_enforced(self):
+        """Test that requests beyond the limit are rejected."""
+        limiter = RateLimiter(max_requests=2, window_seconds=60)
+        
+        assert limiter.is_allowed()
+        assert limiter.is_allowed()
+        assert not limiter.is_allowed()
+        assert limiter.remaining() == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -5,6 +5,7 @@ Unit tests for state transitions, node execution, and error handling.
 """
 
 import pytest
+import asyncio
 from unittest.mock import MagicMock, patch, AsyncMock
 import sys
 import os
@@ -80,7 +81,7 @@ class TestRouterFunction:
 class TestMemoryClient:
     """Tests for MemoryClient integration."""
     
-    @patch("langgraph_cortex.httpx.Client")
+    @patch("langgraph_cortex.httpx.AsyncClient")
     def test_get_pending_tasks(self, mock_client):
         """Test fetching pending tasks."""
         from langgraph_cortex import MemoryClient
@@ -88,27 +89,68 @@ class TestMemoryClient:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.json.return_value = {"tasks": [{"id": "task-1", "text": "Test"}]}
-        mock_client.return_value.get.return_value = mock_response
+        mock_client.return_value.get = AsyncMock(return_value=mock_response)
+        mock_client.return_value.is_closed = False
         
         client = MemoryClient()
-        tasks = client.get_pending_tasks()
+        tasks = asyncio.run(client.get_pending_tasks())
         
         assert len(tasks) == 1
         assert tasks[0]["id"] == "task-1"
     
-    @patch("langgraph_cortex.httpx.Client")
+    @patch("langgraph_cortex.httpx.AsyncClient")
     def test_claim_task(self, mock_client):
         """Test claiming a task."""
         from langgraph_cortex import MemoryClient
         
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_client.return_value.post.return_value = mock_response
+        mock_response.json.return_value = {"status": "success"}
+        mock_client.return_value.post = AsyncMock(return_value=mock_response)
+        mock_client.return_value.is_closed = False
         
         client = MemoryClient()
-        result = client.claim_task("task-1", "engineer_agent")
+        result = asyncio.run(client.claim_task("task-1", "engineer_agent"))
         
-        assert result is True
+        assert result == {"status": "success"}
+
+
+class TestCritiqueParsing:
+    """Tests for reading the Critic's verdict and score."""
+    
+    def test_pass_with_score(self):
+        """Test a well-formed passing critique."""
+        from langgraph_cortex import _parse_critique
+        
+        assert _parse_critique("Verdict:  pass\nSCORE: 9\nISSUES: None") == (True, 9)
+    
+    def test_missing_verdict_fails(self):
+        """Test that a reply without a verdict is treated as a fail."""
+        from langgraph_cortex import _parse_critique
+        
+        assert _parse_critique("VERDICT: FAIL\nSCORE: 3") == (False, 3)
+        assert _parse_critique("Looks fine to me") == (False, None)
+
+
+class TestPromptCache:
+    """Tests for the LLM prompt cache."""
+
+    def test_key_keeps_whitespace(self):
+        """Test that prompts differing only in indentation get different keys."""
+        from langgraph_cortex import PromptCache
+
+        flat = [{"role": "user", "content": "if x:\nreturn 1"}]
+        nested = [{"role": "user", "content": "if x:\n    return 1"}]
+        assert PromptCache.make_key("m", flat, 10) != PromptCache.make_key("m", nested, 10)
+        assert PromptCache.make_key("m", flat, 10) == PromptCache.make_key("m", list(flat), 10)
+
+    def test_disabled_cache_keeps_nothing(self):
+        """Test that a zero-size cache never returns an entry."""
+        from langgraph_cortex import PromptCache
+
+        cache = PromptCache(maxsize=0)
+        cache.put(b"key", "content")
+        assert cache.get(b"key") is None
 
 
 class TestErrorHandling:
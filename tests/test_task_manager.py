@@ -147,6 +147,34 @@ class TestTaskManager:
         """Test getting next task when none are pending."""
         task = self.manager.get_next_task("agent-x")
         assert task is None
+    
+    def test_get_next_tasks_claims_batch(self):
+        """Test claiming several pending tasks in one call."""
+        for i in range(3):
+            self.manager.create_task(TaskCreateRequest(text=f"Task {i}", assignee="agent-a"))
+        
+        tasks = self.manager.get_next_tasks("agent-a", 2)
+        
+        assert [t["text"] for t in tasks] == ["Task 0", "Task 1"]
+        assert len(self.manager.list_tasks(status="in_progress")) == 2
+        assert len(self.manager.list_tasks(status="pending")) == 1
+    
+    def test_resolve_task_id(self):
+        """Test resolving a task ID from its prefix."""
+        task_id = self.manager.create_task(TaskCreateRequest(text="Task", assignee="agent-a"))
+        
+        assert self.manager.resolve_task_id(task_id[:8]) == task_id
+        assert self.manager.resolve_task_id("zzzz") is None
+        assert self.manager.resolve_task_id("") is None
+    
+    def test_resolve_task_id_filters(self):
+        """Test that status and assignee filters exclude other tasks."""
+        task_id = self.manager.create_task(TaskCreateRequest(text="Task", assignee="agent-a"))
+        
+        assert self.manager.resolve_task_id(task_id[:8], "pending", "agent-a") == task_id
+        assert self.manager.resolve_task_id(task_id[:8], "pending", "agent-b") is None
+        self.manager.update_task(TaskUpdateRequest(task_id=task_id, status="completed"))
+        assert self.manager.resolve_task_id(task_id[:8], "pending", "agent-a") is None
 
 
 if __name__ == "__main__":
@@ -67,6 +67,17 @@ class TestVectorStore:
         # Buffer should be empty after flush
         assert len(self.store.buffer) == 0
     
+    def test_add_batch_chains_episodic_entries(self):
+        """Test batch adds return one ID per entry and keep the episodic chain."""
+        ids = self.store.add_batch([
+            {"text": "Python is a programming language", "type": "semantic", "metadata": {}},
+            {"text": "First event", "type": "episodic", "metadata": {}},
+            {"text": "Second event", "type": "episodic"},
+        ])
+        
+        assert len(ids) == 3
+        assert self.store.last_episodic_id == ids[2]
+    
     def test_search_returns_results(self):
         """Test semantic search returns relevant results."""
         self.store.add("Machine learning is a subset of AI", "semantic")